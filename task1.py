@@ -9,7 +9,46 @@
 3. Отсортировать список с помощью встроенной функции sorted
 """
 
-from typing import List, Any
+from typing import List, Any, NamedTuple, Iterable, Iterator, IO, Union, Callable, Optional
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait,
+)
+from itertools import islice
+import bisect
+import heapq
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него работает чистый Python
+    np = None
+
+
+NUMERIC_TYPES = (int, float)
+
+# Границы int64 для колоночного хранения целых чисел
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# Размер пачки токенов в iter_items
+_ITEMS_BATCH = 4096
+
+# Первые символы токенов, для которых classify_token пробует быстрый путь
+_NUMBER_START = frozenset('0123456789+-.')
+
+# Шаблоны повторяют то, что принимают int() и float() в get_user_input,
+# чтобы классифицировать токены без исключений
+_INT_TOKEN = re.compile(r"[+-]?\d+(?:_\d+)*")
+_FLOAT_TOKEN = re.compile(
+    r"[+-]?(?:\d+(?:_\d+)*\.(?:\d+(?:_\d+)*)?|\.\d+(?:_\d+)*)"
+    r"(?:[eE][+-]?\d+(?:_\d+)*)?"
+)
 
 
 def custom_any(iterable) -> bool:
@@ -29,34 +68,317 @@ def custom_any(iterable) -> bool:
     return False
 
 
-def has_positive_numbers(numbers: List[Any]) -> bool:
+def has_positive_numbers(numbers: Iterable[Any]) -> bool:
     """
     Проверяет, содержит ли список хотя бы одно положительное число.
     Нечисловые элементы игнорируются (считаются ложными).
     
     Args:
-        numbers: Список для проверки
+        numbers: Список (или любой итерируемый объект) для проверки
         
     Returns:
         bool: True, если есть хотя бы одно положительное число
     """
     # Генератор, который возвращает True для положительных чисел
-    positive_checks = (isinstance(x, (int, float)) and x > 0 for x in numbers)
+    positive_checks = (isinstance(x, NUMERIC_TYPES) and x > 0 for x in numbers)
     return custom_any(positive_checks)
 
 
-def are_all_numbers(elements: List[Any]) -> bool:
+def are_all_numbers(elements: Iterable[Any]) -> bool:
     """
     Проверяет, состоят ли все элементы списка только из чисел.
     Использует встроенную функцию all.
     
     Args:
-        elements: Список для проверки
+        elements: Список (или любой итерируемый объект) для проверки
+        
+    Returns:
+        bool: True, если все элементы являются числами
+    """
+    return all(isinstance(x, NUMERIC_TYPES) for x in elements)
+
+
+def _is_number(x: Any) -> bool:
+    """Предикат "элемент - число" (на уровне модуля, чтобы его можно было передать в процесс)."""
+    return isinstance(x, NUMERIC_TYPES)
+
+
+# Индекс решающего блока, общий для рабочих процессов пула (см. _init_worker_stop)
+_worker_stop = None
+
+
+def _init_worker_stop(stop) -> None:
+    """Инициализатор процесса пула: запоминает общий индекс остановки."""
+    global _worker_stop
+    _worker_stop = stop
+
+
+def _chunk_any(predicate: Callable[[Any], Any], chunk: List[Any], index: int,
+               stop=None) -> Optional[bool]:
+    """
+    Последовательная проверка any для одного блока.
+    Возвращает None, если уже решил блок с меньшим индексом.
+    """
+    stop = stop if stop is not None else _worker_stop
+    for x in chunk:
+        if stop.value < index:
+            return None
+        if predicate(x):
+            return True
+    return False
+
+
+def _chunk_all(predicate: Callable[[Any], Any], chunk: List[Any], index: int,
+               stop=None) -> Optional[bool]:
+    """
+    Последовательная проверка all для одного блока.
+    Возвращает None, если уже решил блок с меньшим индексом.
+    """
+    stop = stop if stop is not None else _worker_stop
+    for x in chunk:
+        if stop.value < index:
+            return None
+        if not predicate(x):
+            return False
+    return True
+
+
+def _parallel_check(iterable: Iterable[Any], predicate: Callable[[Any], Any],
+                    chunk_check: Callable[..., Optional[bool]],
+                    stop_value: bool, chunk_size: int, workers: Optional[int],
+                    use_processes: bool) -> bool:
+    """
+    Общая часть parallel_any и parallel_all.
+    Разбивает вход на блоки и проверяет их в пуле.
+    
+    Блок, вернувший stop_value или выбросивший исключение, становится
+    решающим: его индекс записывается в общую переменную, и все блоки
+    с большими индексами прерываются прямо внутри цикла по элементам,
+    а ещё не начатые отменяются. Блоки с меньшими индексами доводятся
+    до конца, поэтому результат (или исключение) совпадает с
+    последовательным custom_any/all: побеждает самый ранний решающий блок.
+    
+    Args:
+        iterable: Итерируемый объект
+        predicate: Функция, применяемая к каждому элементу
+        chunk_check: Проверка одного блока (_chunk_any или _chunk_all)
+        stop_value: Результат блока, при котором проверка прерывается
+        chunk_size: Количество элементов в блоке
+        workers: Количество рабочих потоков/процессов (None - по умолчанию)
+        use_processes: Использовать процессы вместо потоков
+        
+    Returns:
+        bool: stop_value, если он встретился хотя бы в одном блоке, иначе not stop_value
+        
+    Raises:
+        ValueError: Если chunk_size или workers меньше 1
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size должно быть >= 1, получено {chunk_size}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers должно быть >= 1, получено {workers}")
+    
+    # Индекс решающего блока в разделяемой памяти: читается без блокировок
+    stop = multiprocessing.RawValue('q', sys.maxsize)
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_stop,
+                                       initargs=(stop,))
+        stop_arg = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        stop_arg = stop
+    
+    iterator = iter(iterable)
+    # Ограничиваем число блоков "в полёте", чтобы не читать весь вход сразу
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    
+    pending = {}
+    completed = set()
+    frontier = 0          # наименьший индекс ещё не завершённого блока
+    submitted = 0
+    decisive_error = None
+    finished = False
+    try:
+        while True:
+            while stop.value == sys.maxsize and len(pending) < max_pending:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                future = executor.submit(chunk_check, predicate, chunk, submitted, stop_arg)
+                pending[future] = submitted
+                submitted += 1
+            
+            # Все блоки до решающего завершены - ответ окончательный
+            if frontier >= stop.value:
+                if decisive_error is not None:
+                    raise decisive_error
+                return stop_value
+            if not pending:
+                finished = True
+                return not stop_value
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                completed.add(index)
+                try:
+                    decisive = future.result() == stop_value
+                except Exception as error:
+                    decisive = True
+                    if index < stop.value:
+                        decisive_error = error
+                else:
+                    if decisive and index < stop.value:
+                        decisive_error = None
+                if decisive and index < stop.value:
+                    stop.value = index
+            while frontier in completed:
+                completed.discard(frontier)
+                frontier += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        # Прерванные блоки завершаются сами, ждать их не нужно
+        executor.shutdown(wait=finished)
+
+
+def parallel_any(iterable: Iterable[Any], predicate: Callable[[Any], Any] = bool,
+                 chunk_size: int = 10_000, workers: Optional[int] = None,
+                 use_processes: bool = False) -> bool:
+    """
+    Параллельный вариант custom_any с досрочным завершением.
+    Результат совпадает с custom_any(map(predicate, iterable)).
+    
+    Для пула процессов predicate и элементы должны сериализоваться pickle
+    (например, функция уровня модуля, а не lambda).
+    
+    Args:
+        iterable: Итерируемый объект для проверки
+        predicate: Функция, применяемая к каждому элементу
+        chunk_size: Количество элементов в блоке
+        workers: Количество рабочих потоков/процессов
+        use_processes: Использовать ProcessPoolExecutor вместо ThreadPoolExecutor
+        
+    Returns:
+        bool: True, если предикат истинен хотя бы для одного элемента
+    """
+    return _parallel_check(iterable, predicate, _chunk_any, True,
+                           chunk_size, workers, use_processes)
+
+
+def parallel_all(iterable: Iterable[Any], predicate: Callable[[Any], Any] = bool,
+                 chunk_size: int = 10_000, workers: Optional[int] = None,
+                 use_processes: bool = False) -> bool:
+    """
+    Параллельный вариант all с досрочным завершением.
+    Результат совпадает с all(map(predicate, iterable)).
+    
+    Args:
+        iterable: Итерируемый объект для проверки
+        predicate: Функция, применяемая к каждому элементу
+        chunk_size: Количество элементов в блоке
+        workers: Количество рабочих потоков/процессов
+        use_processes: Использовать ProcessPoolExecutor вместо ThreadPoolExecutor
+        
+    Returns:
+        bool: True, если предикат истинен для всех элементов
+    """
+    return _parallel_check(iterable, predicate, _chunk_all, False,
+                           chunk_size, workers, use_processes)
+
+
+def parallel_are_all_numbers(elements: Iterable[Any], chunk_size: int = 10_000,
+                             workers: Optional[int] = None,
+                             use_processes: bool = False) -> bool:
+    """
+    Параллельный вариант are_all_numbers.
+    
+    Args:
+        elements: Итерируемый объект для проверки
+        chunk_size: Количество элементов в блоке
+        workers: Количество рабочих потоков/процессов
+        use_processes: Использовать процессы вместо потоков
         
     Returns:
         bool: True, если все элементы являются числами
     """
-    return all(isinstance(x, (int, float)) for x in elements)
+    return parallel_all(elements, _is_number, chunk_size, workers, use_processes)
+
+
+class ListAnalysis(NamedTuple):
+    """
+    Результат однопроходного анализа списка.
+    
+    Attributes:
+        has_positive: Есть ли хотя бы одно положительное число
+        all_numbers: Состоят ли все элементы только из чисел
+        positive_numbers: Положительные числа в исходном порядке
+        non_numbers: Нечисловые элементы в исходном порядке
+        numbers: Все числа (корзина для сортировки)
+        strings: Все строки (корзина для сортировки)
+    """
+    has_positive: bool
+    all_numbers: bool
+    positive_numbers: List[Any]
+    non_numbers: List[Any]
+    numbers: List[Any]
+    strings: List[Any]
+    
+    def sorted_list(self) -> List[Any]:
+        """
+        Возвращает отсортированный список (сначала числа, потом строки),
+        как safe_sort, но без повторного прохода по исходному списку.
+        
+        Returns:
+            List[Any]: Отсортированный список
+        """
+        return sorted(self.numbers) + sorted(self.strings)
+
+
+def analyze_list(items: Iterable[Any]) -> ListAnalysis:
+    """
+    Анализирует список за один проход.
+    Заменяет последовательные вызовы has_positive_numbers, are_all_numbers,
+    выборки положительных/нечисловых элементов и разбиение для safe_sort.
+    
+    Если нужен только один логический результат, дешевле вызвать
+    has_positive_numbers или are_all_numbers: они прерываются досрочно.
+    
+    Args:
+        items: Список для анализа
+        
+    Returns:
+        ListAnalysis: Все результаты анализа
+    """
+    positive_numbers = []
+    non_numbers = []
+    numbers = []
+    strings = []
+    
+    # Локальные ссылки на методы экономят поиск атрибутов в цикле
+    add_positive = positive_numbers.append
+    add_non_number = non_numbers.append
+    add_number = numbers.append
+    add_string = strings.append
+    
+    for x in items:
+        if isinstance(x, NUMERIC_TYPES):
+            add_number(x)
+            if x > 0:
+                add_positive(x)
+        else:
+            add_non_number(x)
+            if isinstance(x, str):
+                add_string(x)
+    
+    return ListAnalysis(
+        has_positive=bool(positive_numbers),
+        all_numbers=not non_numbers,
+        positive_numbers=positive_numbers,
+        non_numbers=non_numbers,
+        numbers=numbers,
+        strings=strings,
+    )
 
 
 def safe_sort(items: List[Any]) -> List[Any]:
@@ -70,16 +392,668 @@ def safe_sort(items: List[Any]) -> List[Any]:
     Returns:
         List[Any]: Отсортированный список
     """
-    # Разделяем числа и строки
-    numbers = [x for x in items if isinstance(x, (int, float))]
-    strings = [x for x in items if isinstance(x, str)]
+    # Разделяем числа и строки за один проход
+    return analyze_list(items).sorted_list()
+
+
+class LiveSortedList:
+    """
+    Изменяемый список с постоянно отсортированными частями.
+    
+    Числа и строки хранятся в отдельных отсортированных списках
+    (вставка и удаление через bisect), а счётчики положительных
+    и нечисловых элементов позволяют отвечать на проверки задачи 1 за O(1).
+    Прочие элементы (не числа и не строки) хранятся в порядке добавления
+    и, как и в safe_sort, в отсортированный вид не попадают.
+    """
+    
+    def __init__(self, items: Iterable[Any] = ()):
+        """
+        Инициализация контейнера.
+        
+        Args:
+            items: Начальные элементы
+        """
+        self.numbers: List[Any] = []
+        self.strings: List[str] = []
+        self.others: List[Any] = []
+        self.positive_count = 0
+        self.non_numeric_count = 0
+        self.extend(items)
+    
+    def add(self, x: Any) -> None:
+        """
+        Добавляет элемент, сохраняя порядок частей.
+        
+        Args:
+            x: Добавляемый элемент
+        """
+        if isinstance(x, NUMERIC_TYPES):
+            bisect.insort(self.numbers, x)
+            if x > 0:
+                self.positive_count += 1
+        else:
+            self.non_numeric_count += 1
+            if isinstance(x, str):
+                bisect.insort(self.strings, x)
+            else:
+                self.others.append(x)
+    
+    def extend(self, items: Iterable[Any]) -> None:
+        """
+        Добавляет пачку элементов.
+        Для больших пачек части досортировываются один раз,
+        а не по одной вставке на элемент.
+        
+        Args:
+            items: Добавляемые элементы
+        """
+        analysis = analyze_list(items)
+        if len(analysis.numbers) + len(analysis.strings) > len(self.numbers) + len(self.strings):
+            self.numbers.extend(analysis.numbers)
+            self.numbers.sort()
+            self.strings.extend(analysis.strings)
+            self.strings.sort()
+        else:
+            for x in analysis.numbers:
+                bisect.insort(self.numbers, x)
+            for x in analysis.strings:
+                bisect.insort(self.strings, x)
+        self.others.extend(x for x in analysis.non_numbers if not isinstance(x, str))
+        self.positive_count += len(analysis.positive_numbers)
+        self.non_numeric_count += len(analysis.non_numbers)
+    
+    def remove(self, x: Any) -> None:
+        """
+        Удаляет одно вхождение элемента.
+        
+        Args:
+            x: Удаляемый элемент
+            
+        Raises:
+            ValueError: Если элемента нет в контейнере
+        """
+        if isinstance(x, NUMERIC_TYPES):
+            self._remove_sorted(self.numbers, x)
+            if x > 0:
+                self.positive_count -= 1
+        else:
+            if isinstance(x, str):
+                self._remove_sorted(self.strings, x)
+            else:
+                self.others.remove(x)
+            self.non_numeric_count -= 1
+    
+    @staticmethod
+    def _remove_sorted(items: List[Any], x: Any) -> None:
+        """Удаляет элемент из отсортированного списка двоичным поиском."""
+        i = bisect.bisect_left(items, x)
+        if i == len(items) or items[i] != x:
+            raise ValueError(f"Элемент {x!r} отсутствует в списке")
+        del items[i]
+    
+    def __len__(self) -> int:
+        return len(self.numbers) + self.non_numeric_count
+    
+    def __contains__(self, x: Any) -> bool:
+        if isinstance(x, NUMERIC_TYPES):
+            items = self.numbers
+        elif isinstance(x, str):
+            items = self.strings
+        else:
+            return x in self.others
+        i = bisect.bisect_left(items, x)
+        return i < len(items) and items[i] == x
+    
+    def has_positive_numbers(self) -> bool:
+        """Есть ли хотя бы одно положительное число (O(1))."""
+        return self.positive_count > 0
+    
+    def are_all_numbers(self) -> bool:
+        """Состоят ли все элементы только из чисел (O(1))."""
+        return self.non_numeric_count == 0
+    
+    def sorted_view(self) -> Iterator[Any]:
+        """
+        Итератор по отсортированному виду без копирования
+        (сначала числа, потом строки).
+        
+        Returns:
+            Iterator[Any]: Элементы в порядке safe_sort
+        """
+        yield from self.numbers
+        yield from self.strings
+    
+    def safe_sort(self) -> List[Any]:
+        """
+        Возвращает отсортированный список без повторной сортировки.
+        
+        Returns:
+            List[Any]: Список в порядке safe_sort
+        """
+        return self.numbers + self.strings
+
+
+def _write_run(run: Iterable[Any], block_size: int) -> IO[bytes]:
+    """
+    Сбрасывает отсортированную серию во временный файл блоками.
+    
+    Args:
+        run: Отсортированная серия элементов (может быть итератором)
+        block_size: Количество элементов в одном блоке pickle
+        
+    Returns:
+        IO[bytes]: Временный файл, перемотанный в начало
+    """
+    run_file = tempfile.TemporaryFile()
+    iterator = iter(run)
+    while True:
+        block = list(islice(iterator, block_size))
+        if not block:
+            break
+        pickle.dump(block, run_file, pickle.HIGHEST_PROTOCOL)
+    run_file.seek(0)
+    return run_file
+
+
+def _read_run(run_file: IO[bytes]) -> Iterator[Any]:
+    """
+    Лениво читает серию из временного файла поблочно.
+    
+    Args:
+        run_file: Файл, записанный _write_run
+        
+    Yields:
+        Any: Следующий элемент серии
+    """
+    while True:
+        try:
+            block = pickle.load(run_file)
+        except EOFError:
+            return
+        yield from block
+
+
+def _merge_runs(runs: List[IO[bytes]], block_size: int) -> IO[bytes]:
+    """
+    Сливает несколько серий в одну новую и закрывает исходные файлы.
+    
+    Args:
+        runs: Файлы серий
+        block_size: Количество элементов в одном блоке pickle
+        
+    Returns:
+        IO[bytes]: Файл объединённой серии
+    """
+    try:
+        return _write_run(heapq.merge(*(_read_run(f) for f in runs)), block_size)
+    finally:
+        for run_file in runs:
+            run_file.close()
+
+
+def _add_run(levels: List[List[IO[bytes]]], run_file: IO[bytes],
+             max_fan_in: int, block_size: int) -> None:
+    """
+    Добавляет серию на нулевой уровень. Как только на уровне набирается
+    max_fan_in серий, они сливаются в одну серию следующего уровня,
+    поэтому открытых файлов не больше max_fan_in на уровень, а каждый
+    элемент переписывается лишь O(log_{max_fan_in}(n / memory_limit)) раз.
+    """
+    level = 0
+    while True:
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(run_file)
+        if len(levels[level]) < max_fan_in:
+            return
+        run_file = _merge_runs(levels[level], block_size)
+        levels[level] = []
+        level += 1
+
+
+def _final_runs(levels: List[List[IO[bytes]]], max_fan_in: int,
+                block_size: int) -> List[IO[bytes]]:
+    """
+    Собирает серии всех уровней и сливает их группами,
+    пока их не останется не больше max_fan_in.
+    """
+    runs = [run_file for level in levels for run_file in level]
+    levels.clear()
+    while len(runs) > max_fan_in:
+        group, runs = runs[:max_fan_in], runs[max_fan_in:]
+        runs.append(_merge_runs(group, block_size))
+    return runs
+
+
+def safe_sort_external(items: Iterable[Any], memory_limit: int = 100_000,
+                       block_size: int = 1024, max_fan_in: int = 16) -> Iterator[Any]:
+    """
+    Внешняя сортировка слиянием для данных, не помещающихся в память.
+    Порядок тот же, что у safe_sort: сначала числа, потом строки.
+    
+    В памяти одновременно хранится не более memory_limit элементов:
+    когда буфер заполняется, числа и строки сортируются и сбрасываются
+    во временные файлы отдельными сериями. Серии сливаются многопроходно
+    не более чем по max_fan_in за раз, а размер блока чтения подбирается
+    так, чтобы (max_fan_in + 1) блоков помещались в memory_limit.
+    Поэтому и память, и число открытых файлов ограничены при любом
+    объёме входа.
+    
+    Args:
+        items: Итерируемый объект (может быть генератором)
+        memory_limit: Максимальное число элементов в памяти (>= 1)
+        block_size: Наибольшее количество элементов в блоке серии
+        max_fan_in: Наибольшее число серий в одном слиянии (>= 2)
+        
+    Yields:
+        Any: Следующий элемент отсортированной последовательности
+        
+    Raises:
+        ValueError: Если memory_limit или block_size меньше 1, max_fan_in меньше 2
+    """
+    if memory_limit < 1:
+        raise ValueError(f"memory_limit должно быть >= 1, получено {memory_limit}")
+    if block_size < 1:
+        raise ValueError(f"block_size должно быть >= 1, получено {block_size}")
+    if max_fan_in < 2:
+        raise ValueError(f"max_fan_in должно быть >= 2, получено {max_fan_in}")
+    
+    # Слияние держит в памяти по блоку на каждую серию и один блок записи
+    block_size = max(1, min(block_size, memory_limit // (max_fan_in + 1)))
+    
+    number_levels: List[List[IO[bytes]]] = []
+    string_levels: List[List[IO[bytes]]] = []
+    numbers: List[Any] = []
+    strings: List[Any] = []
+    final_runs: List[IO[bytes]] = []
+    
+    def spill() -> None:
+        # Сначала сбрасываем и очищаем обе корзины, и только потом сливаем
+        # уровни: иначе слияние шло бы при ещё полной второй корзине
+        written = []
+        for bucket, levels in ((numbers, number_levels), (strings, string_levels)):
+            if bucket:
+                bucket.sort()
+                written.append((levels, _write_run(bucket, block_size)))
+                bucket.clear()
+        for levels, run_file in written:
+            _add_run(levels, run_file, max_fan_in, block_size)
+    
+    try:
+        for x in items:
+            if isinstance(x, NUMERIC_TYPES):
+                numbers.append(x)
+            elif isinstance(x, str):
+                strings.append(x)
+            else:
+                continue
+            if len(numbers) + len(strings) >= memory_limit:
+                spill()
+        
+        if not number_levels and not string_levels:
+            # Всё поместилось в буфер: сортируем в памяти, без диска
+            numbers.sort()
+            strings.sort()
+            yield from numbers
+            yield from strings
+            return
+        
+        # Остаток буфера тоже сбрасывается, чтобы при слиянии память
+        # занимали только блоки серий
+        spill()
+        number_runs = _final_runs(number_levels, max_fan_in, block_size)
+        final_runs.extend(number_runs)
+        string_runs = _final_runs(string_levels, max_fan_in, block_size)
+        final_runs.extend(string_runs)
+        
+        yield from heapq.merge(*(_read_run(f) for f in number_runs))
+        yield from heapq.merge(*(_read_run(f) for f in string_runs))
+    finally:
+        for run_file in final_runs:
+            run_file.close()
+        for level in number_levels + string_levels:
+            for run_file in level:
+                run_file.close()
+
+
+class ColumnarList:
+    """
+    Колоночное представление списка для задачи 1.
+    
+    Целые числа хранятся в столбце int64, вещественные - в столбце float64,
+    строки и прочие объекты - в отдельных списках. Массив тегов хранит тип
+    каждого элемента, поэтому исходный порядок можно восстановить.
+    Значения bool и целые вне диапазона int64 хранятся "как есть"
+    в столбце boxed_numbers, чтобы не терять их тип и точность.
+    
+    Если установлен NumPy, проверки и сортировка выполняются векторно,
+    иначе - на чистом Python поверх array.
+    """
+    
+    TAG_INT = 0
+    TAG_FLOAT = 1
+    TAG_BOXED_NUMBER = 2
+    TAG_STR = 3
+    TAG_OTHER = 4
+    
+    def __init__(self, items: Iterable[Any] = ()):
+        """
+        Раскладывает элементы по столбцам за один проход.
+        
+        Args:
+            items: Исходные элементы
+        """
+        ints = array('q')
+        floats = array('d')
+        self.boxed_numbers: List[Any] = []
+        self.strings: List[str] = []
+        self.others: List[Any] = []
+        self.tags = array('b')
+        
+        add_tag = self.tags.append
+        for x in items:
+            kind = type(x)
+            if kind is int and _INT64_MIN <= x <= _INT64_MAX:
+                ints.append(x)
+                add_tag(self.TAG_INT)
+            elif kind is float:
+                floats.append(x)
+                add_tag(self.TAG_FLOAT)
+            elif isinstance(x, NUMERIC_TYPES):
+                self.boxed_numbers.append(x)
+                add_tag(self.TAG_BOXED_NUMBER)
+            elif isinstance(x, str):
+                self.strings.append(x)
+                add_tag(self.TAG_STR)
+            else:
+                self.others.append(x)
+                add_tag(self.TAG_OTHER)
+        
+        if np is not None:
+            # Представление буфера array без копирования
+            self.ints = np.frombuffer(ints, dtype=np.int64) if ints else np.empty(0, np.int64)
+            self.floats = np.frombuffer(floats, dtype=np.float64) if floats else np.empty(0, np.float64)
+        else:
+            self.ints = ints
+            self.floats = floats
+    
+    def __len__(self) -> int:
+        return len(self.tags)
+    
+    def has_positive_numbers(self) -> bool:
+        """
+        Проверяет наличие хотя бы одного положительного числа.
+        
+        Returns:
+            bool: True, если есть хотя бы одно положительное число
+        """
+        if np is not None:
+            if bool((self.ints > 0).any()) or bool((self.floats > 0).any()):
+                return True
+        elif custom_any(x > 0 for x in self.ints) or custom_any(x > 0 for x in self.floats):
+            return True
+        return custom_any(x > 0 for x in self.boxed_numbers)
+    
+    def are_all_numbers(self) -> bool:
+        """
+        Проверяет, что все элементы являются числами. Работает за O(1).
+        
+        Returns:
+            bool: True, если все элементы являются числами
+        """
+        return not self.strings and not self.others
+    
+    def safe_sort(self) -> List[Any]:
+        """
+        Сортирует элементы так же, как функция safe_sort:
+        сначала числа по значению, затем строки по алфавиту.
+        Сортировка устойчива: равные числа (например, 1.0 и 1)
+        идут в исходном порядке.
+        
+        С NumPy числа сортируются одним вызовом np.lexsort по паре
+        (значение, исходная позиция). Единственное отличие от sorted():
+        NaN попадают в конец чисел, тогда как sorted() оставляет их
+        там, где получится. Если какое-то целое не представимо точно
+        в float64 (|x| > 2^53), используется точный путь на Python.
+        
+        Returns:
+            List[Any]: Отсортированный список
+        """
+        numbers = None
+        if np is not None:
+            numbers = self._sorted_numbers_numpy()
+        if numbers is None:
+            # Числа в исходном порядке: sorted() устойчив, как и в safe_sort
+            ints = self.ints.tolist() if np is not None else self.ints
+            floats = self.floats.tolist() if np is not None else self.floats
+            columns = (iter(ints), iter(floats), iter(self.boxed_numbers))
+            numbers = sorted(next(columns[tag]) for tag in self.tags if tag <= self.TAG_BOXED_NUMBER)
+        
+        return numbers + sorted(self.strings)
+    
+    def _sorted_numbers_numpy(self) -> Optional[List[Any]]:
+        """
+        Векторная устойчивая сортировка чисел.
+        
+        Returns:
+            Optional[List[Any]]: Отсортированные числа или None,
+                если значения нельзя точно сравнивать в float64
+        """
+        # Сравнение в целых Python: NumPy сравнил бы int64 с float в float64,
+        # и 2^53 + 1 округлилось бы до 2^53
+        exact = 1 << 53
+        if len(self.ints) and (int(self.ints.min()) < -exact or int(self.ints.max()) > exact):
+            return None
+        if not all(isinstance(x, float) or -exact <= x <= exact for x in self.boxed_numbers):
+            return None
+        
+        tags = np.frombuffer(self.tags, dtype=np.int8) if len(self.tags) else np.empty(0, np.int8)
+        positions = np.concatenate([np.flatnonzero(tags == tag) for tag in
+                                    (self.TAG_INT, self.TAG_FLOAT, self.TAG_BOXED_NUMBER)])
+        values = np.concatenate([self.ints.astype(np.float64), self.floats,
+                                 np.array(self.boxed_numbers, dtype=np.float64)])
+        order = np.lexsort((positions, values))
+        
+        # Выборка из массива исходных объектов сохраняет их типы
+        originals = np.empty(len(values), dtype=object)
+        originals[:] = self.ints.tolist() + self.floats.tolist() + self.boxed_numbers
+        return originals[order].tolist()
+    
+    def to_list(self) -> List[Any]:
+        """
+        Восстанавливает исходный список в исходном порядке.
+        
+        Returns:
+            List[Any]: Список элементов
+        """
+        ints = self.ints.tolist() if np is not None else self.ints
+        floats = self.floats.tolist() if np is not None else self.floats
+        columns = (iter(ints), iter(floats), iter(self.boxed_numbers),
+                   iter(self.strings), iter(self.others))
+        return [next(columns[tag]) for tag in self.tags]
+
+
+def classify_token(token: str) -> Union[int, float, str]:
+    """
+    Преобразует токен в int, float или оставляет строкой.
+    Правила те же, что в get_user_input, но без try/except.
+    
+    Args:
+        token: Токен без пробельных символов
+        
+    Returns:
+        Union[int, float, str]: Число или исходная строка
+    """
+    # Быстрый путь для числовых токенов (начинаются с цифры ASCII или знака):
+    # без точки int() принимает ровно то же, что _INT_TOKEN, а десятичная
+    # запись с одной точкой проверяется строковыми методами без regex
+    if token[:1] in _NUMBER_START:
+        if '.' not in token:
+            try:
+                return int(token)
+            except ValueError:
+                return token
+        digits = token[1:] if token[0] in '+-' else token
+        if digits.isascii() and digits.replace('.', '', 1).isdigit():
+            return float(token)
+    
+    if '.' in token:
+        if _FLOAT_TOKEN.fullmatch(token):
+            return float(token)
+    elif _INT_TOKEN.fullmatch(token):
+        return int(token)
+    return token
+
+
+def iter_tokens(stream: IO[str], chunk_size: int = 1 << 20) -> Iterator[str]:
+    """
+    Потоково разбивает текст на токены по пробельным символам.
+    Читает поток большими блоками; токен, разрезанный границей блока,
+    переносится в следующий блок.
+    
+    Args:
+        stream: Текстовый поток (файл или sys.stdin)
+        chunk_size: Размер читаемого блока в символах
+        
+    Yields:
+        str: Следующий токен
+    """
+    tail = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        tokens = (tail + chunk).split() if tail else chunk.split()
+        # Последний токен может продолжиться в следующем блоке
+        if tokens and not chunk[-1].isspace():
+            tail = tokens.pop()
+        else:
+            tail = ''
+        yield from tokens
+    if tail:
+        yield tail
+
+
+def iter_items(stream: IO[str], chunk_size: int = 1 << 20) -> Iterator[Union[int, float, str]]:
+    """
+    Потоково читает элементы списка из текстового потока.
+    Результат можно сразу передавать в has_positive_numbers,
+    are_all_numbers, analyze_list или safe_sort_external — память
+    при этом не зависит от размера входа (кроме самого analyze_list).
+    
+    Args:
+        stream: Текстовый поток (файл или sys.stdin)
+        chunk_size: Размер читаемого блока в символах
+        
+    Returns:
+        Iterator[Union[int, float, str]]: Ленивый итератор элементов
+    """
+    tokens = iter_tokens(stream, chunk_size)
+    while True:
+        batch = list(islice(tokens, _ITEMS_BATCH))
+        if not batch:
+            return
+        # Пачка из одних целых переводится одним map(int) на C;
+        # без точки int() принимает ровно то же, что classify_token
+        try:
+            converted = list(map(int, batch))
+        except ValueError:
+            converted = list(map(classify_token, batch))
+        yield from converted
+
+
+def read_items(path: str, chunk_size: int = 1 << 20) -> Iterator[Union[int, float, str]]:
+    """
+    Потоково читает элементы списка из файла ('-' означает stdin).
+    
+    Args:
+        path: Путь к файлу или '-'
+        chunk_size: Размер читаемого блока в символах
+        
+    Yields:
+        Union[int, float, str]: Следующий элемент
+    """
+    if path == '-':
+        yield from iter_items(sys.stdin, chunk_size)
+        return
+    with open(path, encoding='utf-8', buffering=chunk_size) as f:
+        yield from iter_items(f, chunk_size)
+
+
+class StreamSummary(NamedTuple):
+    """
+    Сводка по потоку элементов, собранная за один проход.
+    Вместо полных списков хранятся только счётчики и первые элементы.
+    
+    Attributes:
+        total: Количество элементов
+        positive_count: Количество положительных чисел
+        non_number_count: Количество нечисловых элементов
+        positive_preview: Первые положительные числа
+        non_number_preview: Первые нечисловые элементы
+        sorted_preview: Начало отсортированной последовательности
+    """
+    total: int
+    positive_count: int
+    non_number_count: int
+    positive_preview: List[Any]
+    non_number_preview: List[Any]
+    sorted_preview: List[Any]
+    
+    @property
+    def has_positive(self) -> bool:
+        return self.positive_count > 0
+    
+    @property
+    def all_numbers(self) -> bool:
+        return self.non_number_count == 0
+
+
+def summarize_items(items: Iterable[Any], preview: int = 10,
+                    memory_limit: int = 100_000) -> StreamSummary:
+    """
+    Проверяет поток элементов и сортирует его с постоянной памятью:
+    счётчики обновляются в том же проходе, в котором safe_sort_external
+    читает вход, а от результата сортировки берётся только начало.
     
-    # Сортируем каждую группу
-    numbers.sort()
-    strings.sort()
+    Args:
+        items: Итерируемый объект (может быть генератором)
+        preview: Сколько элементов сохранять в каждом образце
+        memory_limit: Буфер safe_sort_external в элементах
+        
+    Returns:
+        StreamSummary: Сводка по потоку
+    """
+    counts = [0, 0, 0]  # всего, положительных, нечисловых
+    positive_preview: List[Any] = []
+    non_number_preview: List[Any] = []
     
-    # Объединяем (сначала числа, потом строки)
-    return numbers + strings
+    def counted() -> Iterator[Any]:
+        for x in items:
+            counts[0] += 1
+            if isinstance(x, NUMERIC_TYPES):
+                if x > 0:
+                    counts[1] += 1
+                    if len(positive_preview) < preview:
+                        positive_preview.append(x)
+            else:
+                counts[2] += 1
+                if len(non_number_preview) < preview:
+                    non_number_preview.append(x)
+            yield x
+    
+    sorted_items = safe_sort_external(counted(), memory_limit)
+    try:
+        # Первый же элемент сортировки появляется только после чтения всего входа
+        sorted_preview = list(islice(sorted_items, preview))
+        if not sorted_preview:
+            next(sorted_items, None)
+    finally:
+        sorted_items.close()
+    
+    return StreamSummary(counts[0], counts[1], counts[2],
+                         positive_preview, non_number_preview, sorted_preview)
 
 
 def get_user_input() -> List[Any]:
@@ -106,19 +1080,7 @@ def get_user_input() -> List[Any]:
             items = user_input.split()
             
             # Преобразуем строки в числа, где это возможно
-            result = []
-            for item in items:
-                try:
-                    # Пробуем преобразовать в число
-                    if '.' in item:
-                        result.append(float(item))
-                    else:
-                        result.append(int(item))
-                except ValueError:
-                    # Если не число, оставляем как строку
-                    result.append(item)
-            
-            return result
+            return [classify_token(item) for item in items]
             
         except Exception as e:
             print(f"Ошибка ввода: {e}. Попробуйте снова.")
@@ -127,7 +1089,11 @@ def get_user_input() -> List[Any]:
 def main():
     """Основная функция программы."""
     
-    # Получаем список от пользователя
+    # Файл/stdin (python task1.py FILE или -) обрабатывается потоково
+    if len(sys.argv) > 1:
+        main_stream(sys.argv[1])
+        return
+    
     user_list = get_user_input()
     
     print(f"\nВведенный список: {user_list}")
@@ -137,29 +1103,57 @@ def main():
     print("РЕЗУЛЬТАТЫ:")
     print("-"*40)
     
-    # 1. Проверка наличия положительных чисел с custom_any
-    has_positive = has_positive_numbers(user_list)
-    print(f"1. Есть ли положительные числа? {has_positive}")
+    # Один проход по списку вместо нескольких отдельных проверок
+    analysis = analyze_list(user_list)
+    
+    # 1. Проверка наличия положительных чисел
+    print(f"1. Есть ли положительные числа? {analysis.has_positive}")
     
     # Показываем, какие элементы положительные
-    if has_positive:
-        pos_numbers = [x for x in user_list if isinstance(x, (int, float)) and x > 0]
-        print(f"   Положительные числа: {pos_numbers}")
+    if analysis.has_positive:
+        print(f"   Положительные числа: {analysis.positive_numbers}")
     
-    # 2. Проверка, все ли элементы - числа с all
-    all_numbers = are_all_numbers(user_list)
-    print(f"2. Все элементы являются числами? {all_numbers}")
+    # 2. Проверка, все ли элементы - числа
+    print(f"2. Все элементы являются числами? {analysis.all_numbers}")
     
-    if not all_numbers:
-        non_numbers = [x for x in user_list if not isinstance(x, (int, float))]
-        print(f"   Нечисловые элементы: {non_numbers}")
+    if not analysis.all_numbers:
+        print(f"   Нечисловые элементы: {analysis.non_numbers}")
     
     # 3. Сортировка списка
-    sorted_list = safe_sort(user_list.copy())
+    sorted_list = analysis.sorted_list()
     print(f"3. Отсортированный список: {sorted_list}")
     
     print("\n" + "="*60)
 
 
+def main_stream(path: str) -> None:
+    """
+    Обрабатывает список из файла или stdin ('-') с постоянной памятью
+    и печатает сводку вместо полного списка.
+    
+    Args:
+        path: Путь к файлу или '-'
+    """
+    summary = summarize_items(read_items(path))
+    
+    print("\n" + "-"*40)
+    print(f"РЕЗУЛЬТАТЫ ({summary.total} элементов):")
+    print("-"*40)
+    
+    print(f"1. Есть ли положительные числа? {summary.has_positive}")
+    if summary.has_positive:
+        print(f"   Положительных чисел: {summary.positive_count}, "
+              f"первые: {summary.positive_preview}")
+    
+    print(f"2. Все элементы являются числами? {summary.all_numbers}")
+    if not summary.all_numbers:
+        print(f"   Нечисловых элементов: {summary.non_number_count}, "
+              f"первые: {summary.non_number_preview}")
+    
+    print(f"3. Начало отсортированного списка: {summary.sorted_preview}")
+    
+    print("\n" + "="*60)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
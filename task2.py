@@ -7,7 +7,54 @@
 и когда достигнет последнего элемента, начинать сначала.
 """
 
-from typing import Tuple, Any, Iterator
+from typing import Tuple, Any, Iterator, List, MutableSequence, Optional, Sequence, Union, Dict, Hashable, Deque
+from array import array
+from collections import OrderedDict, deque
+from multiprocessing import shared_memory
+import asyncio
+import itertools
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+# Есть ли GIL (на free-threaded сборках 3.13+ sys._is_gil_enabled() возвращает False)
+_GIL_ENABLED = getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+class CyclicView(Sequence):
+    """
+    Ленивое представление среза бесконечного цикла по кортежу.
+    Элементы не копируются: позиция i отображается в data[i % len(data)].
+    """
+    
+    def __init__(self, data: Tuple[Any, ...], positions: range):
+        """
+        Args:
+            data: Непустой кортеж
+            positions: Абсолютные позиции в бесконечном цикле
+        """
+        self.data = data
+        self.positions = positions
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return CyclicView(self.data, self.positions[item])
+        return self.data[self.positions[item] % len(self.data)]
+    
+    def __iter__(self) -> Iterator:
+        data = self.data
+        n = len(data)
+        return (data[i % n] for i in self.positions)
+    
+    def __repr__(self) -> str:
+        return f"CyclicView({self.data!r}, {self.positions!r})"
 
 
 class CyclicTupleIterator:
@@ -18,6 +65,10 @@ class CyclicTupleIterator:
     Реализует протокол итератора Python (методы __iter__ и __next__).
     """
     
+    # Кэш данных кортежа в виде array по коду типа (для next_array),
+    # создаётся в экземпляре лениво в _as_array
+    _arrays: Optional[Dict[str, array]] = None
+    
     def __init__(self, data: Tuple[Any, ...]):
         """
         Инициализация итератора.
@@ -70,6 +121,190 @@ class CyclicTupleIterator:
             
         return result
     
+    def _take(self, sequence, k: int):
+        """
+        Возвращает следующие k элементов из sequence (копии данных кортежа
+        в виде tuple, list или array) и сдвигает индекс так же, как k вызовов __next__.
+        Результат собирается из хвоста, целых повторов и головы кортежа.
+        
+        Args:
+            sequence: Данные кортежа в нужном представлении
+            k: Количество элементов
+            
+        Raises:
+            ValueError: Если k < 0
+            StopIteration: Если кортеж пуст, а k > 0
+        """
+        if k < 0:
+            raise ValueError(f"k должно быть >= 0, получено {k}")
+        n = len(sequence)
+        if k == 0:
+            return sequence[:0]
+        if n == 0:
+            raise StopIteration("Кортеж пуст")
+        
+        start = self.index
+        head = sequence[start:start + k]
+        remaining = k - len(head)
+        if remaining:
+            repeats, tail = divmod(remaining, n)
+            head = head + sequence * repeats + sequence[:tail]
+        
+        self.index = (start + k) % n
+        return head
+    
+    def next_n(self, k: int) -> List[Any]:
+        """
+        Возвращает следующие k элементов одним вызовом.
+        Состояние итератора после вызова такое же, как после k вызовов next().
+        
+        Args:
+            k: Количество элементов (k >= 0)
+            
+        Returns:
+            List[Any]: Следующие k элементов
+            
+        Raises:
+            ValueError: Если k < 0
+            StopIteration: Если кортеж пуст, а k > 0
+        """
+        return list(self._take(self.data, k))
+    
+    def fill(self, buffer: MutableSequence, start: int = 0, count: Optional[int] = None) -> int:
+        """
+        Заполняет переданный буфер (list, array или memoryview) следующими
+        элементами на месте, без создания нового списка.
+        
+        Args:
+            buffer: Изменяемая последовательность для заполнения
+            start: Позиция в буфере, с которой начинается запись
+            count: Количество элементов (по умолчанию - до конца буфера)
+            
+        Returns:
+            int: Количество записанных элементов
+            
+        Raises:
+            ValueError: Если count < 0 или выходит за пределы буфера
+            StopIteration: Если кортеж пуст, а count > 0
+        """
+        if count is None:
+            count = len(buffer) - start
+        if start < 0 or start + count > len(buffer):
+            raise ValueError("Запрошенный диапазон выходит за пределы буфера")
+        
+        if isinstance(buffer, memoryview):
+            values = self._take(self._as_array(buffer.format), count)
+        elif isinstance(buffer, array):
+            values = self._take(self._as_array(buffer.typecode), count)
+        else:
+            values = self._take(self.data, count)
+        buffer[start:start + count] = values
+        return count
+    
+    def next_array(self, k: int, typecode: str = 'd') -> array:
+        """
+        Возвращает следующие k элементов числового кортежа в виде array.
+        Массив собирается из копий буфера целиком (без поэлементных вызовов)
+        и может быть передан дальше как memoryview без копирования.
+        
+        Args:
+            k: Количество элементов
+            typecode: Код типа array ('d', 'q', 'i', ...)
+            
+        Returns:
+            array: Следующие k элементов
+            
+        Raises:
+            TypeError: Если элементы кортежа не подходят под typecode
+            StopIteration: Если кортеж пуст, а k > 0
+        """
+        return self._take(self._as_array(typecode), k)
+    
+    def _as_array(self, typecode: str) -> array:
+        """Возвращает (и кэширует) данные кортежа в виде array с заданным кодом типа."""
+        # Словарь создаётся только при первом вызове, чтобы не занимать
+        # память в каждом из миллионов итераторов, которым он не нужен
+        arrays = self._arrays
+        if arrays is None:
+            arrays = self._arrays = {}
+        cached = arrays.get(typecode)
+        if cached is None:
+            cached = arrays[typecode] = array(typecode, self.data)
+        return cached
+    
+    def advance(self, k: int) -> None:
+        """
+        Сдвигает итератор на k шагов за O(1) (отрицательное k - назад).
+        Эквивалентно k вызовам next() для k >= 0.
+        
+        Args:
+            k: Количество шагов
+            
+        Raises:
+            StopIteration: Если кортеж пуст
+        """
+        if not self.data:
+            raise StopIteration("Кортеж пуст")
+        self.index = (self.index + k) % len(self.data)
+    
+    def seek(self, position: int) -> None:
+        """
+        Переходит к абсолютной позиции в бесконечном цикле за O(1).
+        Позиция отсчитывается от начала итерации (как после reset()).
+        
+        Args:
+            position: Номер элемента в бесконечной последовательности
+            
+        Raises:
+            StopIteration: Если кортеж пуст
+        """
+        if not self.data:
+            raise StopIteration("Кортеж пуст")
+        self.index = position % len(self.data)
+    
+    def peek(self, offset: int = 0) -> Any:
+        """
+        Возвращает элемент на offset шагов вперёд (назад при offset < 0),
+        не сдвигая итератор. peek() - элемент, который вернёт next().
+        
+        Args:
+            offset: Смещение относительно текущей позиции
+            
+        Returns:
+            Any: Элемент кортежа
+            
+        Raises:
+            StopIteration: Если кортеж пуст
+        """
+        if not self.data:
+            raise StopIteration("Кортеж пуст")
+        return self.data[(self.index + offset) % len(self.data)]
+    
+    def __getitem__(self, item: Union[int, slice]) -> Union[Any, CyclicView]:
+        """
+        Доступ к бесконечному циклу по абсолютной позиции или срезу
+        (без учёта текущего состояния итератора).
+        
+        Args:
+            item: Позиция или срез с заданной границей stop
+            
+        Returns:
+            Union[Any, CyclicView]: Элемент или ленивое представление среза
+            
+        Raises:
+            IndexError: Если кортеж пуст
+            ValueError: Если у среза не задан stop (цикл бесконечен)
+        """
+        if not self.data:
+            raise IndexError("Кортеж пуст")
+        if isinstance(item, slice):
+            if item.stop is None:
+                raise ValueError("Срез бесконечного цикла должен иметь stop")
+            start = 0 if item.start is None else item.start
+            step = 1 if item.step is None else item.step
+            return CyclicView(self.data, range(start, item.stop, step))
+        return self.data[item % len(self.data)]
+    
     def reset(self) -> None:
         """Сбрасывает итератор в начало."""
         self.index = 0
@@ -84,6 +319,849 @@ class CyclicTupleIterator:
         return self.index
 
 
+# Общие экземпляры равных кортежей для CompactCyclicIterator (LRU, не более INTERN_LIMIT)
+INTERN_LIMIT = 4096
+_interned_tuples: 'OrderedDict[Hashable, Tuple[Any, ...]]' = OrderedDict()
+
+
+def _type_signature(data: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Типы элементов кортежа (вложенные кортежи - рекурсивно).
+    Равные, но разнотипные кортежи ((1, 2) и (1.0, 2.0), (1, 0) и
+    (True, False)) получают разные сигнатуры.
+    """
+    return tuple(_type_signature(x) if type(x) is tuple else type(x) for x in data)
+
+
+def intern_tuple(data: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Возвращает общий экземпляр кортежа, равного data и совпадающего
+    с ним по типам элементов. Нехешируемые кортежи возвращаются без изменений.
+    Хранится не более INTERN_LIMIT давно использованных кортежей.
+    
+    Args:
+        data: Кортеж
+        
+    Returns:
+        Tuple[Any, ...]: Ранее сохранённый кортеж или сам data
+    """
+    try:
+        key = (_type_signature(data), data)
+        shared = _interned_tuples.get(key)
+    except TypeError:
+        return data
+    if shared is not None:
+        _interned_tuples.move_to_end(key)
+        return shared
+    _interned_tuples[key] = data
+    if len(_interned_tuples) > INTERN_LIMIT:
+        _interned_tuples.popitem(last=False)
+    return data
+
+
+def clear_interned_tuples() -> None:
+    """Очищает таблицу общих кортежей."""
+    _interned_tuples.clear()
+
+
+class CompactCyclicIterator:
+    """
+    Компактный вариант CyclicTupleIterator для миллионов живых объектов:
+    __slots__ вместо __dict__ и общий экземпляр для равных кортежей.
+    Методы итерации и навигации заимствованы у CyclicTupleIterator
+    (методы fill/next_array с кэшем массивов не поддерживаются).
+    """
+    
+    __slots__ = ('data', 'index')
+    
+    def __init__(self, data: Tuple[Any, ...]):
+        """
+        Инициализация итератора.
+        
+        Args:
+            data: Кортеж для итерации
+            
+        Raises:
+            TypeError: Если data не является кортежем
+        """
+        if not isinstance(data, tuple):
+            raise TypeError(f"Ожидается кортеж, получен {type(data).__name__}")
+        
+        self.data = intern_tuple(data)
+        self.index = 0
+    
+    __iter__ = CyclicTupleIterator.__iter__
+    __next__ = CyclicTupleIterator.__next__
+    __getitem__ = CyclicTupleIterator.__getitem__
+    _take = CyclicTupleIterator._take
+    next_n = CyclicTupleIterator.next_n
+    advance = CyclicTupleIterator.advance
+    seek = CyclicTupleIterator.seek
+    peek = CyclicTupleIterator.peek
+    reset = CyclicTupleIterator.reset
+    get_current_index = CyclicTupleIterator.get_current_index
+
+
+def _measure_per_object(factory, count: int) -> float:
+    """
+    Измеряет через tracemalloc средний объём памяти на один объект.
+    
+    Args:
+        factory: Функция от номера объекта, создающая объект
+        count: Количество объектов
+        
+    Returns:
+        float: Байт на объект
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory(i) for i in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def memory_report_iterators(count: int = 10 ** 6) -> None:
+    """
+    Сравнивает память на объект для CyclicTupleIterator и
+    CompactCyclicIterator, когда итераторы оборачивают равные кортежи.
+    
+    Args:
+        count: Количество живых итераторов
+    """
+    source = [1, 2, 3, 4, 5]
+    
+    # tuple(source) каждый раз создаёт новый равный кортеж
+    regular = _measure_per_object(lambda i: CyclicTupleIterator(tuple(source)), count)
+    compact = _measure_per_object(lambda i: CompactCyclicIterator(tuple(source)), count)
+    
+    print(f"\nПамять на итератор при {count:,} объектах:")
+    print(f"  CyclicTupleIterator:   {regular:8.1f} байт")
+    print(f"  CompactCyclicIterator: {compact:8.1f} байт")
+    print(f"  Экономия: {regular - compact:.1f} байт ({regular / compact:.1f}x)")
+
+
+def smooth_weighted_schedule(weights: Sequence[int]) -> List[int]:
+    """
+    Строит один полный период плавного взвешенного round-robin
+    (алгоритм nginx): элемент с весом 5 выбирается 5 раз за период,
+    причём выборы перемежаются с другими элементами, а не идут подряд.
+    Веса предварительно сокращаются на общий делитель.
+    
+    Args:
+        weights: Неотрицательные целые веса (хотя бы один положительный)
+        
+    Returns:
+        List[int]: Индексы элементов в порядке выбора
+        
+    Raises:
+        ValueError: Если есть отрицательный вес или все веса нулевые
+    """
+    if any(w < 0 for w in weights):
+        raise ValueError(f"Веса должны быть неотрицательными, получено {list(weights)}")
+    divisor = 0
+    for w in weights:
+        divisor = math.gcd(divisor, w)
+    if divisor == 0:
+        raise ValueError("Хотя бы один вес должен быть положительным")
+    
+    weights = [w // divisor for w in weights]
+    total = sum(weights)
+    current = [0] * len(weights)
+    schedule = []
+    for _ in range(total):
+        best = 0
+        for i, w in enumerate(weights):
+            current[i] += w
+            if current[i] > current[best]:
+                best = i
+        current[best] -= total
+        schedule.append(best)
+    return schedule
+
+
+class WeightedCyclicIterator:
+    """
+    Циклический итератор с плавным взвешенным выбором.
+    
+    Период расписания вычисляется заранее, поэтому каждый выбор -
+    это обращение по индексу за O(1). Выдача и пакетные методы
+    (next_n, advance, peek) делегируются CyclicTupleIterator по
+    развёрнутому периоду. Изменения весов накапливаются и применяются
+    одним пересчётом перед следующей выдачей, с сохранением
+    относительной позиции в периоде.
+    """
+    
+    def __init__(self, data: Tuple[Any, ...], weights: Sequence[int]):
+        """
+        Инициализация итератора.
+        
+        Args:
+            data: Кортеж для итерации
+            weights: Целые веса элементов (той же длины, что и data)
+            
+        Raises:
+            TypeError: Если data не является кортежем
+            ValueError: Если длины data и weights различаются или веса некорректны
+        """
+        if not isinstance(data, tuple):
+            raise TypeError(f"Ожидается кортеж, получен {type(data).__name__}")
+        if len(weights) != len(data):
+            raise ValueError(f"Ожидается {len(data)} весов, получено {len(weights)}")
+        
+        self.data = data
+        self.weights = list(weights)
+        self._cursor = CyclicTupleIterator(self._expand())
+        self._dirty = False
+    
+    def _expand(self) -> Tuple[Any, ...]:
+        """Разворачивает период расписания в кортеж элементов."""
+        return tuple(self.data[i] for i in smooth_weighted_schedule(self.weights))
+    
+    def _sync(self) -> CyclicTupleIterator:
+        """Применяет накопленные изменения весов и возвращает курсор."""
+        if self._dirty:
+            old = self._cursor
+            period = self._expand()
+            self._cursor = CyclicTupleIterator(period)
+            self._cursor.index = old.index * len(period) // len(old.data)
+            self._dirty = False
+        return self._cursor
+    
+    def set_weight(self, position: int, weight: int) -> None:
+        """
+        Изменяет вес одного элемента.
+        
+        Args:
+            position: Индекс элемента в data
+            weight: Новый вес
+        """
+        self.update_weights({position: weight})
+    
+    def update_weights(self, changes: Dict[int, int]) -> None:
+        """
+        Изменяет веса нескольких элементов. Расписание пересчитывается
+        один раз - лениво, при следующей выдаче.
+        
+        Args:
+            changes: Отображение "индекс элемента -> новый вес"
+            
+        Raises:
+            ValueError: Если новые веса некорректны
+        """
+        weights = list(self.weights)
+        for position, weight in changes.items():
+            weights[position] = weight
+        # Проверяем веса сразу, чтобы ошибка не всплыла при следующем next()
+        if any(w < 0 for w in weights) or not any(weights):
+            raise ValueError(f"Некорректные веса: {weights}")
+        self.weights = weights
+        self._dirty = True
+    
+    @property
+    def period(self) -> Tuple[Any, ...]:
+        """Один полный период взвешенного расписания."""
+        return self._sync().data
+    
+    def __iter__(self) -> Iterator:
+        return self
+    
+    def __next__(self) -> Any:
+        return next(self._sync())
+    
+    def next_n(self, k: int) -> List[Any]:
+        """
+        Возвращает следующие k выборов одним вызовом.
+        
+        Args:
+            k: Количество элементов
+            
+        Returns:
+            List[Any]: Следующие k элементов
+        """
+        return self._sync().next_n(k)
+    
+    def advance(self, k: int) -> None:
+        """Сдвигает итератор на k выборов за O(1)."""
+        self._sync().advance(k)
+    
+    def peek(self, offset: int = 0) -> Any:
+        """Возвращает выбор на offset шагов вперёд, не сдвигая итератор."""
+        return self._sync().peek(offset)
+    
+    def reset(self) -> None:
+        """Сбрасывает итератор в начало периода."""
+        self._sync().reset()
+
+
+class ConcurrentCyclicIterator:
+    """
+    Потокобезопасный циклический итератор для раздачи элементов
+    по кругу (round-robin) из многих потоков.
+    
+    Каждый вызов next() получает "талон" из счётчика itertools.count
+    и отображает его в элемент по модулю. На сборках CPython с GIL
+    __next__ у count выполняется целиком под GIL и атомарен, поэтому
+    блокировки не нужны: элементы не дублируются и не пропускаются.
+    Эта атомарность - свойство GIL, а не гарантия языка: на сборках
+    без GIL (free-threaded, sys._is_gil_enabled() == False) талоны
+    выдаются под блокировкой.
+    """
+    
+    def __init__(self, data: Tuple[Any, ...]):
+        """
+        Инициализация итератора.
+        
+        Args:
+            data: Кортеж для итерации
+            
+        Raises:
+            TypeError: Если data не является кортежем
+        """
+        if not isinstance(data, tuple):
+            raise TypeError(f"Ожидается кортеж, получен {type(data).__name__}")
+        
+        self.data = data
+        self._tickets = itertools.count()
+        # Последний выданный талон (для get_current_index)
+        self._last_ticket = -1
+        self._lock = None if _GIL_ENABLED else threading.Lock()
+    
+    def __iter__(self) -> Iterator:
+        return self
+    
+    def __next__(self) -> Any:
+        """
+        Возвращает следующий элемент кортежа.
+        
+        Returns:
+            Any: Следующий элемент кортежа
+            
+        Raises:
+            StopIteration: Если кортеж пуст
+        """
+        if not self.data:
+            raise StopIteration("Кортеж пуст")
+        if self._lock is None:
+            ticket = next(self._tickets)
+        else:
+            with self._lock:
+                ticket = next(self._tickets)
+        self._last_ticket = ticket
+        return self.data[ticket % len(self.data)]
+    
+    def reset(self) -> None:
+        """Сбрасывает итератор в начало."""
+        self._tickets = itertools.count()
+        self._last_ticket = -1
+    
+    def get_current_index(self) -> int:
+        """
+        Возвращает индекс элемента, который будет выдан следующим.
+        При конкурентном доступе значение может сразу устареть.
+        
+        Returns:
+            int: Текущий индекс
+        """
+        if not self.data:
+            return 0
+        return (self._last_ticket + 1) % len(self.data)
+
+
+class AsyncCyclicIterator:
+    """
+    Асинхронный циклический итератор (протокол __aiter__/__anext__)
+    для распределения корутин по кортежу конечных точек без блокировки
+    цикла событий.
+    
+    Если задан max_in_flight, каждый элемент может быть выдан не более
+    max_in_flight раз одновременно: занятые слоты пропускаются, а когда
+    заняты все, выдача ждёт освобождения (обратное давление).
+    Выданный элемент освобождается автоматически при использовании
+    "async with iterator.acquire() as element" (освобождается именно
+    занятый слот, что важно при повторяющихся элементах-весах)
+    или вручную через release().
+    """
+    
+    def __init__(self, data: Tuple[Any, ...], max_in_flight: Optional[int] = None):
+        """
+        Инициализация итератора.
+        
+        Args:
+            data: Кортеж для итерации
+            max_in_flight: Предел одновременных выдач одного элемента (None - без предела)
+            
+        Raises:
+            TypeError: Если data не является кортежем
+            ValueError: Если max_in_flight < 1
+        """
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f"max_in_flight должно быть >= 1, получено {max_in_flight}")
+        
+        self._cursor = CyclicTupleIterator(data)
+        self.data = data
+        self.max_in_flight = max_in_flight
+        self.in_flight = [0] * len(data)
+        # Ожидающие свободного слота: у каждого своя future, release()
+        # будит первого через set_result, не создавая задач
+        self._waiters: Deque[asyncio.Future] = deque()
+    
+    def __aiter__(self) -> "AsyncCyclicIterator":
+        return self
+    
+    async def __anext__(self) -> Any:
+        """
+        Возвращает следующий элемент, пропуская занятые слоты.
+        
+        Returns:
+            Any: Следующий элемент кортежа
+            
+        Raises:
+            StopAsyncIteration: Если кортеж пуст
+        """
+        if not self.data:
+            raise StopAsyncIteration("Кортеж пуст")
+        if self.max_in_flight is None:
+            return next(self._cursor)
+        return self.data[await self._acquire_slot()]
+    
+    async def _acquire_slot(self) -> int:
+        """Ждёт и занимает свободный слот, возвращает его индекс."""
+        while True:
+            slot = self._claim_slot()
+            if slot is not None:
+                return slot
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Пробуждение досталось отменённой задаче - передаём его дальше
+                    self._wake_next()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+    
+    def _claim_slot(self) -> Optional[int]:
+        """Занимает ближайший свободный слот, начиная с текущей позиции."""
+        n = len(self.data)
+        start = self._cursor.index
+        for offset in range(n):
+            slot = (start + offset) % n
+            if self.in_flight[slot] < self.max_in_flight:
+                self.in_flight[slot] += 1
+                self._cursor.index = (slot + 1) % n
+                return slot
+        return None
+    
+    def release(self, element: Any) -> None:
+        """
+        Освобождает ранее выданный элемент.
+        Слот ищется по идентичности, затем по равенству, поэтому при
+        повторяющихся элементах может освободиться другой слот с тем же
+        значением; acquire() освобождает именно занятый слот.
+        
+        Args:
+            element: Элемент, полученный из итератора
+            
+        Raises:
+            ValueError: Если элемент не был выдан
+        """
+        if self.max_in_flight is None:
+            return
+        candidates = [i for i, x in enumerate(self.data) if x is element and self.in_flight[i]]
+        if not candidates:
+            candidates = [i for i, x in enumerate(self.data) if x == element and self.in_flight[i]]
+        if not candidates:
+            raise ValueError(f"Элемент {element!r} не был выдан")
+        self.release_slot(candidates[0])
+    
+    def release_slot(self, slot: int) -> None:
+        """
+        Освобождает занятый слот по индексу и будит одного ожидающего.
+        Работает и вне цикла событий (например, при очистке после asyncio.run).
+        
+        Args:
+            slot: Индекс слота
+            
+        Raises:
+            ValueError: Если слот не занят
+        """
+        if not 0 <= slot < len(self.in_flight) or not self.in_flight[slot]:
+            raise ValueError(f"Слот {slot} не занят")
+        self.in_flight[slot] -= 1
+        self._wake_next()
+    
+    def _wake_next(self) -> None:
+        """Будит первого ещё ожидающего (отменённые future пропускаются)."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+    
+    def acquire(self) -> "_AsyncLease":
+        """
+        Возвращает асинхронный контекстный менеджер, выдающий элемент
+        и освобождающий его при выходе.
+        
+        Returns:
+            _AsyncLease: Контекстный менеджер
+        """
+        return _AsyncLease(self)
+    
+    async def next_n(self, k: int) -> List[Any]:
+        """
+        Возвращает следующие k элементов. Без предела занятости
+        выполняется одним срезом, иначе каждая выдача ждёт свободного слота.
+        
+        Args:
+            k: Количество элементов
+            
+        Returns:
+            List[Any]: Следующие k элементов
+            
+        Raises:
+            StopAsyncIteration: Если кортеж пуст, а k > 0
+        """
+        if self.max_in_flight is None:
+            try:
+                return self._cursor.next_n(k)
+            except StopIteration as e:
+                raise StopAsyncIteration(*e.args) from None
+        return [await self.__anext__() for _ in range(k)]
+    
+    def reset(self) -> None:
+        """Сбрасывает итератор в начало (занятость слотов сохраняется)."""
+        self._cursor.reset()
+
+
+class _AsyncLease:
+    """Контекстный менеджер для AsyncCyclicIterator.acquire()."""
+    
+    def __init__(self, iterator: AsyncCyclicIterator):
+        self._iterator = iterator
+        self._slot: Optional[int] = None
+    
+    async def __aenter__(self) -> Any:
+        iterator = self._iterator
+        if iterator.max_in_flight is None:
+            return await iterator.__anext__()
+        if not iterator.data:
+            raise StopAsyncIteration("Кортеж пуст")
+        self._slot = await iterator._acquire_slot()
+        return iterator.data[self._slot]
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            self._iterator.release_slot(slot)
+
+
+class SharedCyclicIterator:
+    """
+    Циклический итератор, курсор которого хранится в разделяемой памяти
+    (multiprocessing.shared_memory) и сдвигается под межпроцессной
+    блокировкой. Все процессы пула вытягивают одну общую последовательность.
+    
+    Числовой кортеж (typecode 'q' или 'd') также размещается в разделяемой
+    памяти: при передаче итератора в дочерний процесс сериализуется только
+    имя сегмента, а не данные. Прочие кортежи передаются как есть.
+    
+    Блокировка multiprocessing.Lock передаётся только через наследование,
+    поэтому итератор нужно отдавать в Process(args=...) или в initializer
+    пула, а не в аргументы задач Pool.map. Блокировка создаётся в контексте
+    ctx (по умолчанию - контекст метода запуска по умолчанию), и процессы
+    нужно создавать из того же контекста: ctx.Process(...).
+    
+    Сегмент освобождается через close() или "with SharedCyclicIterator(...) as it";
+    если close() не вызван, это делается при сборке объекта.
+    """
+    
+    _CURSOR_SIZE = 8  # Счётчик выдач - int64 в начале сегмента
+    
+    def __init__(self, data: Tuple[Any, ...], typecode: Optional[str] = None, ctx=None):
+        """
+        Создаёт сегмент разделяемой памяти и блокировку.
+        
+        Args:
+            data: Кортеж для итерации
+            typecode: 'q' или 'd', чтобы разместить числовые данные в разделяемой памяти
+            ctx: Контекст multiprocessing (get_context('spawn') и т.п.),
+                 из которого будут создаваться процессы; None - по умолчанию
+            
+        Raises:
+            TypeError: Если data не является кортежем
+            ValueError: Если typecode не 'q' и не 'd'
+        """
+        if not isinstance(data, tuple):
+            raise TypeError(f"Ожидается кортеж, получен {type(data).__name__}")
+        if typecode not in (None, 'q', 'd'):
+            raise ValueError(f"typecode должен быть 'q', 'd' или None, получено {typecode!r}")
+        
+        ctx = ctx if ctx is not None else multiprocessing.get_context()
+        payload = array(typecode, data).tobytes() if typecode else b''
+        self._closed = True  # пока сегмент не создан, закрывать нечего
+        self._shm = shared_memory.SharedMemory(create=True, size=self._CURSOR_SIZE + len(payload))
+        self._closed = False
+        self._shm.buf[self._CURSOR_SIZE:self._CURSOR_SIZE + len(payload)] = payload
+        self._lock = ctx.Lock()
+        self._length = len(data)
+        self._typecode = typecode
+        self._data: Optional[Tuple[Any, ...]] = data
+        # При fork объект копируется без pickle, поэтому владельца определяем по pid
+        self._owner_pid = os.getpid()
+        self._attach()
+        self._cursor[0] = 0
+    
+    def _attach(self) -> None:
+        """Создаёт представление счётчика поверх сегмента."""
+        self._cursor = self._shm.buf[:self._CURSOR_SIZE].cast('q')
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            'name': self._shm.name,
+            'lock': self._lock,
+            'length': self._length,
+            'typecode': self._typecode,
+            # Числовые данные уже лежат в разделяемой памяти
+            'data': None if self._typecode else self._data,
+        }
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._shm = shared_memory.SharedMemory(name=state['name'])
+        self._lock = state['lock']
+        self._length = state['length']
+        self._typecode = state['typecode']
+        self._data = state['data']
+        self._owner_pid = None
+        self._closed = False
+        self._attach()
+    
+    @property
+    def data(self) -> Tuple[Any, ...]:
+        """Данные кортежа (в дочернем процессе читаются из разделяемой памяти один раз)."""
+        if self._data is None:
+            size = self._length * array(self._typecode).itemsize
+            raw = self._shm.buf[self._CURSOR_SIZE:self._CURSOR_SIZE + size]
+            self._data = tuple(array(self._typecode, raw.tobytes()))
+            raw.release()
+        return self._data
+    
+    def _claim(self, k: int) -> int:
+        """Атомарно резервирует k позиций и возвращает первую."""
+        with self._lock:
+            ticket = self._cursor[0]
+            self._cursor[0] = ticket + k
+        return ticket
+    
+    def __iter__(self) -> Iterator:
+        return self
+    
+    def __next__(self) -> Any:
+        """
+        Возвращает следующий элемент общей последовательности.
+        
+        Raises:
+            StopIteration: Если кортеж пуст
+        """
+        if not self._length:
+            raise StopIteration("Кортеж пуст")
+        data = self.data
+        return data[self._claim(1) % self._length]
+    
+    def next_n(self, k: int) -> List[Any]:
+        """
+        Резервирует k подряд идущих позиций одной блокировкой
+        и возвращает соответствующие элементы.
+        
+        Args:
+            k: Количество элементов
+            
+        Returns:
+            List[Any]: Следующие k элементов общей последовательности
+        """
+        local = CyclicTupleIterator(self.data)
+        if k > 0 and self._length:
+            local.seek(self._claim(k))
+        return local.next_n(k)
+    
+    def get_current_index(self) -> int:
+        """Возвращает индекс элемента, который будет выдан следующим."""
+        return self._cursor[0] % self._length if self._length else 0
+    
+    def reset(self) -> None:
+        """Сбрасывает общий курсор в начало."""
+        with self._lock:
+            self._cursor[0] = 0
+    
+    def close(self) -> None:
+        """
+        Отключается от разделяемой памяти. Создатель итератора
+        также удаляет сегмент. Повторный вызов ничего не делает.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # Представление счётчика нужно отпустить до закрытия сегмента,
+        # иначе SharedMemory.close() падает с BufferError
+        self._cursor.release()
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            self._shm.unlink()
+    
+    def __enter__(self) -> "SharedCyclicIterator":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def __del__(self) -> None:
+        # Страховка на случай, если close() так и не вызвали
+        if not getattr(self, '_closed', True):
+            self.close()
+
+
+def _shared_cursor_worker(picker: SharedCyclicIterator, picks: int, results) -> None:
+    """Рабочий процесс бенчмарка: выбирает элементы из SharedCyclicIterator."""
+    local = [0] * picker._length
+    for _ in range(picks):
+        local[next(picker)] += 1
+    picker.close()
+    results.put(local)
+
+
+def _manager_cursor_worker(namespace, lock, data: Tuple[Any, ...], picks: int, results) -> None:
+    """Рабочий процесс бенчмарка: курсор в Manager().Namespace."""
+    local = [0] * len(data)
+    for _ in range(picks):
+        with lock:
+            index = namespace.index
+            namespace.index = index + 1
+        local[data[index % len(data)]] += 1
+    results.put(local)
+
+
+def benchmark_shared_cursor(process_counts=(1, 2, 4, 8), picks_per_process: int = 2_000) -> None:
+    """
+    Сравнивает SharedCyclicIterator с курсором в Manager().Namespace
+    по пропускной способности при нескольких процессах и проверяет,
+    что общая последовательность не теряет и не дублирует выдачи.
+    
+    Args:
+        process_counts: Количества процессов для замеров
+        picks_per_process: Сколько элементов выбирает каждый процесс
+    """
+    data = tuple(range(8))
+    
+    print(f"\n{'Процессов':>9} | {'Manager, выд/с':>15} | {'shared_memory, выд/с':>21} | Ускорение")
+    print("-" * 66)
+    
+    with multiprocessing.Manager() as manager:
+        for processes in process_counts:
+            rates = []
+            for kind in ('manager', 'shared'):
+                results = multiprocessing.Queue()
+                if kind == 'manager':
+                    namespace = manager.Namespace()
+                    namespace.index = 0
+                    lock = manager.Lock()
+                    args = (namespace, lock, data, picks_per_process, results)
+                    target = _manager_cursor_worker
+                else:
+                    picker = SharedCyclicIterator(data, typecode='q')
+                    args = (picker, picks_per_process, results)
+                    target = _shared_cursor_worker
+                
+                workers = [multiprocessing.Process(target=target, args=args) for _ in range(processes)]
+                started = time.perf_counter()
+                for p in workers:
+                    p.start()
+                counts = [0] * len(data)
+                for _ in workers:
+                    for i, c in enumerate(results.get()):
+                        counts[i] += c
+                for p in workers:
+                    p.join()
+                elapsed = time.perf_counter() - started
+                
+                if kind == 'shared':
+                    picker.close()
+                assert max(counts) - min(counts) <= 1, f"Неравномерная раздача: {counts}"
+                rates.append(processes * picks_per_process / elapsed)
+            
+            print(f"{processes:>9} | {rates[0]:>15,.0f} | {rates[1]:>21,.0f} | {rates[1] / rates[0]:.2f}x")
+
+
+class LockedCyclicIterator(CyclicTupleIterator):
+    """
+    CyclicTupleIterator под глобальной блокировкой.
+    Используется как базовая линия в benchmark_concurrent_pickers.
+    """
+    
+    def __init__(self, data: Tuple[Any, ...]):
+        super().__init__(data)
+        self._lock = threading.Lock()
+    
+    def __next__(self) -> Any:
+        with self._lock:
+            return super().__next__()
+
+
+def benchmark_concurrent_pickers(thread_counts=(1, 2, 4, 8, 16, 32, 64),
+                                 picks_per_thread: int = 20_000) -> None:
+    """
+    Сравнивает пропускную способность ConcurrentCyclicIterator и
+    CyclicTupleIterator под глобальной блокировкой при 1-64 потоках,
+    а также проверяет, что все выдачи распределены поровну.
+    
+    Args:
+        thread_counts: Количества потоков для замеров
+        picks_per_thread: Сколько элементов выбирает каждый поток
+    """
+    data = tuple(range(8))
+    
+    print(f"\n{'Потоков':>8} | {'Блокировка, выд/с':>18} | {'Талоны, выд/с':>15} | Ускорение")
+    print("-" * 60)
+    
+    for threads in thread_counts:
+        rates = []
+        for iterator_class in (LockedCyclicIterator, ConcurrentCyclicIterator):
+            picker = iterator_class(data)
+            counts = [0] * len(data)
+            counts_lock = threading.Lock()
+            barrier = threading.Barrier(threads + 1)
+            
+            def worker():
+                local = [0] * len(data)
+                barrier.wait()
+                for _ in range(picks_per_thread):
+                    local[next(picker)] += 1
+                with counts_lock:
+                    for i, c in enumerate(local):
+                        counts[i] += c
+            
+            pool = [threading.Thread(target=worker) for _ in range(threads)]
+            for t in pool:
+                t.start()
+            barrier.wait()
+            started = time.perf_counter()
+            for t in pool:
+                t.join()
+            elapsed = time.perf_counter() - started
+            
+            total = threads * picks_per_thread
+            # Без дублей и пропусков каждый элемент выдан одинаковое число раз (±1)
+            assert max(counts) - min(counts) <= 1, f"Неравномерная раздача: {counts}"
+            rates.append(total / elapsed)
+        
+        print(f"{threads:>8} | {rates[0]:>18,.0f} | {rates[1]:>15,.0f} | {rates[1] / rates[0]:.2f}x")
+
+
 def demonstrate_iterator():
     """Демонстрирует работу циклического итератора."""
     
@@ -197,4 +1275,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python task2.py bench - замеры производительности вместо демонстрации
+    if sys.argv[1:] == ['bench']:
+        benchmark_concurrent_pickers()
+        benchmark_shared_cursor()
+        memory_report_iterators()
+    else:
+        main()
\ No newline at end of file
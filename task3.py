@@ -8,9 +8,179 @@
 Реализовать метод schedule, генерирующий дни показа фильма.
 """
 
-from datetime import datetime, timedelta
-from typing import List, Tuple, Generator
+from datetime import date, datetime, timedelta
+from typing import List, Tuple, Generator, Optional, Union, Iterable, Callable, Dict, Set, Iterator, Any, Hashable
+from array import array
+from collections import OrderedDict
+from operator import itemgetter
+import asyncio
+import bisect
 import calendar
+import csv
+import functools
+import io
+import heapq
+import itertools
+import json
+import math
+import mmap
+import random
+import struct
+import sys
+import time
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для Movie.schedule_array
+    np = None
+
+
+Period = Tuple[datetime, datetime]
+
+ONE_DAY = timedelta(days=1)
+
+# Порядковый номер 1970-01-01 (начало отсчёта datetime64)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@functools.lru_cache(maxsize=65536)
+def format_day(ordinal: int) -> str:
+    """
+    Форматирует день (порядковый номер date.toordinal) как ДД.ММ.ГГГГ.
+    Результаты кэшируются: в отчётах одни и те же даты повторяются.
+    
+    Args:
+        ordinal: Порядковый номер дня
+        
+    Returns:
+        str: Дата в формате ДД.ММ.ГГГГ
+    """
+    day = date.fromordinal(ordinal)
+    return f"{day.day:02d}.{day.month:02d}.{day.year:04d}"
+
+
+def normalize_periods(periods: Iterable[Period]) -> List[Period]:
+    """
+    Объединяет пересекающиеся и соседние периоды за один линейный проход.
+    
+    Args:
+        periods: Периоды, отсортированные по дате начала
+        
+    Returns:
+        List[Period]: Непересекающиеся несоседние периоды по возрастанию
+    """
+    result: List[Period] = []
+    for start, end in periods:
+        if result and start <= result[-1][1] + ONE_DAY:
+            if end > result[-1][1]:
+                result[-1] = (result[-1][0], end)
+        else:
+            result.append((start, end))
+    return result
+
+
+def union_periods(first: List[Period], second: List[Period]) -> List[Period]:
+    """
+    Объединение двух нормализованных расписаний.
+    
+    Args:
+        first: Нормализованные периоды
+        second: Нормализованные периоды
+        
+    Returns:
+        List[Period]: Нормализованные периоды объединения
+    """
+    return normalize_periods(heapq.merge(first, second))
+
+
+def intersect_periods(first: List[Period], second: List[Period]) -> List[Period]:
+    """
+    Пересечение двух нормализованных расписаний (два указателя).
+    
+    Args:
+        first: Нормализованные периоды
+        second: Нормализованные периоды
+        
+    Returns:
+        List[Period]: Нормализованные периоды пересечения
+    """
+    result: List[Period] = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start <= end:
+            result.append((start, end))
+        # Сдвигаем тот период, который заканчивается раньше
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def subtract_periods(first: List[Period], second: List[Period]) -> List[Period]:
+    """
+    Разность двух нормализованных расписаний: дни из first, которых нет в second.
+    
+    Args:
+        first: Нормализованные периоды
+        second: Нормализованные периоды (вычитаемые)
+        
+    Returns:
+        List[Period]: Нормализованные периоды разности
+    """
+    result: List[Period] = []
+    j = 0
+    for start, end in first:
+        current = start
+        # Пропускаем вычитаемые периоды, закончившиеся до начала текущего
+        while j < len(second) and second[j][1] < current:
+            j += 1
+        k = j
+        while k < len(second) and second[k][0] <= end:
+            if second[k][0] > current:
+                result.append((current, second[k][0] - ONE_DAY))
+            current = max(current, second[k][1] + ONE_DAY)
+            k += 1
+        if current <= end:
+            result.append((current, end))
+    return result
+
+
+def count_period_days(periods: Iterable[Period]) -> int:
+    """
+    Считает общее число дней в периодах (без учёта пересечений).
+    
+    Args:
+        periods: Периоды
+        
+    Returns:
+        int: Сумма длин периодов в днях
+    """
+    return sum((end - start).days + 1 for start, end in periods)
+
+
+def _day_periods(movie) -> List[Period]:
+    """
+    Все дни показа фильма как нормализованные периоды.
+    Без правил повторения это normalized_periods(); правила разворачиваются
+    в серии подряд идущих дней (за время, линейное по числу их дней).
+    """
+    if not movie.recurrences:
+        return movie.normalized_periods()
+    periods: List[Period] = []
+    run_start = previous = None
+    for ordinal in movie.schedule(output='ordinal'):
+        if previous is None or ordinal != previous + 1:
+            if previous is not None:
+                periods.append((datetime.fromordinal(run_start), datetime.fromordinal(previous)))
+            run_start = ordinal
+        previous = ordinal
+    if previous is not None:
+        periods.append((datetime.fromordinal(run_start), datetime.fromordinal(previous)))
+    return periods
 
 
 class Movie:
@@ -18,96 +188,1881 @@ class Movie:
     Класс фильма с расписанием показов.
     """
     
-    def __init__(self, title: str):
+    def __init__(self, title: str):
+        """
+        Инициализация фильма.
+        
+        Args:
+            title: Название фильма
+        """
+        self.title = title
+        self.schedule_periods: List[Tuple[datetime, datetime]] = []
+        # Индекс периодов по дням (полночь): дни начала (для bisect)
+        # и префиксный максимум дней окончания
+        self._starts: List[datetime] = []
+        self._max_ends: List[datetime] = []
+        # Кэш нормализованных периодов, сбрасывается при добавлении периода
+        self._normalized: Optional[List[Period]] = None
+        # Кэш отформатированных строк: (название, текст) для __str__ и текст описания
+        self._str_cache: Optional[Tuple[str, str]] = None
+        self._summary_cache: Optional[str] = None
+        # Номер версии расписания: растёт при каждом изменении (ключ внешних кэшей)
+        self.version = 0
+        self._prefix_days: Optional[List[int]] = None
+        # Правила повторения (RecurrenceRule), хранящиеся символически
+        self.recurrences: List["RecurrenceRule"] = []
+        # Слагаемые включений-исключений для правил (см. _rule_union_terms)
+        self._union_terms: Optional[List[Tuple[int, "RecurrenceRule"]]] = None
+        # Подписчики на изменения расписания: callback(movie, period_or_rule)
+        self._listeners: List[Callable[["Movie", Union[Period, "RecurrenceRule"]], None]] = []
+    
+    def add_schedule_period(self, start_date: datetime, end_date: datetime) -> None:
+        """
+        Добавляет период показа фильма.
+        Позиция вставки находится двоичным поиском, пересортировка не нужна.
+        
+        Args:
+            start_date: Дата начала показа
+            end_date: Дата окончания показа
+            
+        Raises:
+            ValueError: Если дата начала позже даты окончания
+        """
+        if start_date > end_date:
+            raise ValueError(f"Дата начала {start_date} позже даты окончания {end_date}")
+        
+        # Индекс строится по дням, как и schedule(): время суток не учитывается.
+        # bisect_right сохраняет порядок добавления при равных днях начала
+        start_day = self._to_day(start_date)
+        end_day = self._to_day(end_date)
+        position = bisect.bisect_right(self._starts, start_day)
+        self._invalidate()
+        self.schedule_periods.insert(position, (start_date, end_date))
+        self._starts.insert(position, start_day)
+        
+        # Префиксный максимум меняется только начиная с позиции вставки
+        running = self._max_ends[position - 1] if position else end_day
+        self._max_ends.insert(position, end_day)
+        for i in range(position, len(self._max_ends)):
+            running = max(running, self._to_day(self.schedule_periods[i][1]))
+            if i > position and self._max_ends[i] == running:
+                break
+            self._max_ends[i] = running
+        
+        self._notify((start_date, end_date))
+    
+    def add_schedule_periods(self, periods: Iterable[Period]) -> None:
+        """
+        Добавляет сразу много периодов: одна сортировка и одна перестройка
+        индексов вместо вставки по одному периоду.
+        
+        Args:
+            periods: Периоды (start_date, end_date)
+            
+        Raises:
+            ValueError: Если у какого-либо периода дата начала позже даты окончания
+        """
+        periods = list(periods)
+        for start_date, end_date in periods:
+            if start_date > end_date:
+                raise ValueError(f"Дата начала {start_date} позже даты окончания {end_date}")
+        if not periods:
+            return
+        
+        # Устойчивая сортировка сохраняет порядок добавления при равных датах начала
+        self.schedule_periods.extend(periods)
+        self.schedule_periods.sort(key=itemgetter(0))
+        self._starts = [self._to_day(start_date) for start_date, _ in self.schedule_periods]
+        self._max_ends = list(itertools.accumulate(
+            (self._to_day(end_date) for _, end_date in self.schedule_periods), max))
+        self._invalidate()
+        
+        for period in periods:
+            self._notify(period)
+    
+    def add_recurrence(self, rule: "RecurrenceRule") -> None:
+        """
+        Добавляет правило повторения показов (например, "по выходным").
+        Правило хранится символически и разворачивается лениво.
+        
+        Args:
+            rule: Правило повторения
+            
+        Raises:
+            TypeError: Если rule не является RecurrenceRule
+        """
+        if not isinstance(rule, RecurrenceRule):
+            raise TypeError(f"Ожидается RecurrenceRule, получен {type(rule).__name__}")
+        self.recurrences.append(rule)
+        self._invalidate()
+        self._notify(rule)
+    
+    def add_listener(self, listener: Callable[["Movie", Union[Period, "RecurrenceRule"]], None]) -> None:
+        """
+        Подписывает функцию на изменения расписания (используется каталогами и кэшами).
+        
+        Args:
+            listener: Функция listener(movie, item), где item - добавленный
+                период (start_date, end_date) или правило RecurrenceRule
+        """
+        self._listeners.append(listener)
+    
+    def _invalidate(self) -> None:
+        """Сбрасывает кэши, зависящие от расписания."""
+        self.version += 1
+        self._normalized = None
+        self._str_cache = None
+        self._summary_cache = None
+        self._union_terms = None
+    
+    def _notify(self, item: Union[Period, "RecurrenceRule"]) -> None:
+        """Сообщает подписчикам о добавленном периоде или правиле."""
+        for listener in self._listeners:
+            listener(self, item)
+    
+    @staticmethod
+    def _to_day(value: Union[date, datetime]) -> datetime:
+        """Приводит дату или дату-время к полуночи этого дня."""
+        return datetime(value.year, value.month, value.day)
+    
+    def is_showing(self, day: Union[date, datetime]) -> bool:
+        """
+        Проверяет, идёт ли фильм в указанный день, за O(log n).
+        
+        Args:
+            day: Дата
+            
+        Returns:
+            bool: True, если день входит хотя бы в один период
+        """
+        day = self._to_day(day)
+        # Последний период, начавшийся не позже day
+        i = bisect.bisect_right(self._starts, day) - 1
+        if i >= 0 and self._max_ends[i] >= day:
+            return True
+        return any(rule.contains(day) for rule in self.recurrences)
+    
+    def next_showing(self, after: Union[date, datetime]) -> Optional[datetime]:
+        """
+        Возвращает ближайший день показа строго после указанной даты, за O(log n).
+        
+        Args:
+            after: Дата, после которой ищется показ
+            
+        Returns:
+            Optional[datetime]: Дата показа или None, если показов больше нет
+        """
+        day = self._to_day(after) + timedelta(days=1)
+        if self.is_showing(day):
+            return day
+        # Иначе следующий показ - начало первого периода после day
+        i = bisect.bisect_right(self._starts, day)
+        candidates = [self._starts[i]] if i < len(self._starts) else []
+        for rule in self.recurrences:
+            ordinal = next(rule.ordinals(day.toordinal()), None)
+            if ordinal is not None:
+                candidates.append(datetime.fromordinal(ordinal))
+        return min(candidates, default=None)
+    
+    def periods_overlapping(self, start: Union[date, datetime],
+                            end: Union[date, datetime]) -> List[Tuple[datetime, datetime]]:
+        """
+        Возвращает периоды, пересекающиеся с отрезком [start, end]
+        (с точностью до дня, как в schedule()). Границы кандидатов находятся двоичным поиском: по префиксному
+        максимуму дат окончания и по датам начала.
+        
+        Args:
+            start: Начало отрезка
+            end: Конец отрезка
+            
+        Returns:
+            List[Tuple[datetime, datetime]]: Периоды в порядке даты начала
+        """
+        start = self._to_day(start)
+        end = self._to_day(end)
+        lo = bisect.bisect_left(self._max_ends, start)
+        hi = bisect.bisect_right(self._starts, end)
+        return [
+            period for period in self.schedule_periods[lo:hi]
+            if self._to_day(period[1]) >= start
+        ]
+    
+    def normalized_periods(self) -> List[Period]:
+        """
+        Возвращает периоды показа, в которых пересекающиеся и соседние
+        периоды объединены. Границы приводятся к дням (полночь), поэтому
+        schedule(), count_days() и индекс is_showing() видят одни и те же дни.
+        Результат кэшируется до следующего добавления.
+        
+        Returns:
+            List[Period]: Непересекающиеся периоды по возрастанию
+        """
+        if self._normalized is None:
+            self._normalized = normalize_periods(
+                (self._to_day(start_date), self._to_day(end_date))
+                for start_date, end_date in self.schedule_periods
+            )
+            self._prefix_days = None
+        return self._normalized
+    
+    def _window_bounds(self, start: Optional[Union[date, datetime]],
+                       end: Optional[Union[date, datetime]]) -> Tuple[int, int]:
+        """
+        Находит двоичным поиском диапазон нормализованных периодов,
+        пересекающихся с окном [start, end] (None - без ограничения).
+        
+        Returns:
+            Tuple[int, int]: Индексы первого и следующего за последним периода
+        """
+        periods = self.normalized_periods()
+        if start is not None and end is not None and start > end:
+            return 0, 0
+        lo = 0
+        hi = len(periods)
+        if start is not None:
+            # Периоды с датой начала не позже start; последний из них может захватывать start
+            lo = bisect.bisect_right(periods, (start, datetime.max))
+            if lo and periods[lo - 1][1] >= start:
+                lo -= 1
+        if end is not None:
+            hi = bisect.bisect_right(periods, (end, datetime.max))
+        return lo, max(lo, hi)
+    
+    @classmethod
+    def from_periods(cls, title: str, periods: Iterable[Period]) -> "Movie":
+        """
+        Создаёт фильм из готовых периодов.
+        
+        Args:
+            title: Название фильма
+            periods: Периоды показа
+            
+        Returns:
+            Movie: Новый фильм
+        """
+        movie = cls(title)
+        for start_date, end_date in periods:
+            movie.add_schedule_period(start_date, end_date)
+        return movie
+    
+    def union(self, other: "Movie") -> "Movie":
+        """
+        Расписание из дней, когда идёт хотя бы один из двух фильмов.
+        Периоды объединяются без развёртывания в отдельные дни,
+        правила повторения обоих фильмов переносятся символически.
+        
+        Args:
+            other: Другой фильм
+            
+        Returns:
+            Movie: Фильм с расписанием-объединением
+        """
+        periods = union_periods(self.normalized_periods(), other.normalized_periods())
+        movie = Movie.from_periods(f"{self.title} ∪ {other.title}", periods)
+        for rule in itertools.chain(self.recurrences, other.recurrences):
+            movie.add_recurrence(rule)
+        return movie
+    
+    def intersection(self, other: "Movie") -> "Movie":
+        """
+        Расписание из дней, когда идут оба фильма.
+        Правила повторения разворачиваются в периоды (см. _day_periods).
+        
+        Args:
+            other: Другой фильм
+            
+        Returns:
+            Movie: Фильм с расписанием-пересечением
+        """
+        periods = intersect_periods(_day_periods(self), _day_periods(other))
+        return Movie.from_periods(f"{self.title} ∩ {other.title}", periods)
+    
+    def difference(self, other: "Movie") -> "Movie":
+        """
+        Расписание из дней, когда идёт этот фильм, но не идёт other.
+        Правила повторения разворачиваются в периоды (см. _day_periods).
+        
+        Args:
+            other: Другой фильм
+            
+        Returns:
+            Movie: Фильм с расписанием-разностью
+        """
+        periods = subtract_periods(_day_periods(self), _day_periods(other))
+        return Movie.from_periods(f"{self.title} \\ {other.title}", periods)
+    
+    SCHEDULE_OUTPUTS = ('datetime', 'date', 'ordinal')
+    
+    def _window_periods(self, start: Optional[Union[date, datetime]],
+                        end: Optional[Union[date, datetime]],
+                        reverse: bool = False) -> Iterator[Period]:
+        """
+        Возвращает нормализованные периоды, обрезанные по окну [start, end].
+        Первый подходящий период находится двоичным поиском.
+        """
+        start = None if start is None else self._to_day(start)
+        end = None if end is None else self._to_day(end)
+        periods = self.normalized_periods()
+        lo, hi = self._window_bounds(start, end)
+        
+        indices = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        for i in indices:
+            start_date, end_date = periods[i]
+            if start is not None and start_date < start:
+                start_date = start
+            if end is not None and end_date > end:
+                end_date = end
+            yield start_date, end_date
+    
+    def schedule(self, start: Optional[Union[date, datetime]] = None,
+                 end: Optional[Union[date, datetime]] = None,
+                 reverse: bool = False,
+                 output: str = 'datetime') -> Generator[Union[datetime, date, int], None, None]:
+        """
+        Генератор, возвращающий дни показа фильма по порядку.
+        Дни из пересекающихся периодов возвращаются один раз.
+        Период занимает все дни от дня начала до дня окончания
+        включительно; в формате 'datetime' дни выдаются на полночь.
+        
+        Если задано окно [start, end], генератор сразу переходит
+        (двоичным поиском) к первому подходящему периоду и обрезает
+        периоды по границам окна, не перебирая прошедшие даты.
+        
+        Args:
+            start: Первая дата окна (None - с начала расписания)
+            end: Последняя дата окна включительно (None - до конца расписания)
+            reverse: Выдавать даты в обратном порядке
+            output: Формат дат: 'datetime', 'date' или 'ordinal'
+                (порядковый номер дня int, без создания объектов дат)
+            
+        Yields:
+            Union[datetime, date, int]: Следующая дата показа
+            
+        Raises:
+            ValueError: Если формат output неизвестен
+        """
+        if output not in self.SCHEDULE_OUTPUTS:
+            raise ValueError(f"Неизвестный формат {output!r}, ожидается один из {self.SCHEDULE_OUTPUTS}")
+        
+        if self.recurrences:
+            ordinals = self._merged_ordinals(start, end, reverse)
+            if output == 'ordinal':
+                yield from ordinals
+            elif output == 'date':
+                yield from map(date.fromordinal, ordinals)
+            else:
+                yield from map(datetime.fromordinal, ordinals)
+            return
+        
+        for start_date, end_date in self._window_periods(start, end, reverse):
+            if output == 'datetime' and reverse:
+                current_date = end_date
+                while current_date >= start_date:
+                    yield current_date
+                    current_date -= ONE_DAY
+                continue
+            if output == 'datetime':
+                current_date = start_date
+                while current_date <= end_date:
+                    yield current_date
+                    current_date += ONE_DAY
+                continue
+            
+            first, last = start_date.toordinal(), end_date.toordinal()
+            ordinals = range(last, first - 1, -1) if reverse else range(first, last + 1)
+            if output == 'ordinal':
+                yield from ordinals
+            else:
+                yield from map(date.fromordinal, ordinals)
+    
+    def _merged_ordinals(self, start: Optional[Union[date, datetime]],
+                         end: Optional[Union[date, datetime]],
+                         reverse: bool) -> Iterator[int]:
+        """
+        Сливает дни периодов и правил повторения в один упорядоченный
+        поток порядковых номеров без повторов.
+        """
+        lo = None if start is None else self._to_day(start).toordinal()
+        hi = None if end is None else self._to_day(end).toordinal()
+        
+        def period_ordinals():
+            for start_date, end_date in self._window_periods(start, end, reverse):
+                first, last = start_date.toordinal(), end_date.toordinal()
+                yield from (range(last, first - 1, -1) if reverse else range(first, last + 1))
+        
+        streams = [period_ordinals()]
+        streams.extend(rule.ordinals(lo, hi, reverse) for rule in self.recurrences)
+        previous = None
+        for ordinal in heapq.merge(*streams, reverse=reverse):
+            if ordinal != previous:
+                yield ordinal
+                previous = ordinal
+    
+    def schedule_array(self, start: Optional[Union[date, datetime]] = None,
+                       end: Optional[Union[date, datetime]] = None):
+        """
+        Возвращает все дни показа в окне одним массивом NumPy datetime64[D].
+        Массив строится одним arange на период и одной конкатенацией.
+        
+        Args:
+            start: Первая дата окна (None - с начала расписания)
+            end: Последняя дата окна включительно (None - до конца расписания)
+            
+        Returns:
+            numpy.ndarray: Массив дат datetime64[D]
+            
+        Raises:
+            ImportError: Если NumPy не установлен
+        """
+        if np is None:
+            raise ImportError("Для schedule_array требуется NumPy")
+        
+        if self.recurrences:
+            # Порядковые номера переводятся в дни от эпохи 1970-01-01
+            ordinals = np.fromiter(self.schedule(start, end, output='ordinal'), dtype=np.int64)
+            return (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+        
+        chunks = [
+            np.arange(np.datetime64(start_date.date(), 'D'),
+                      np.datetime64(end_date.date(), 'D') + 1)
+            for start_date, end_date in self._window_periods(start, end)
+        ]
+        if not chunks:
+            return np.empty(0, dtype='datetime64[D]')
+        return np.concatenate(chunks)
+    
+    def _count_period_days(self, start: Optional[Union[date, datetime]] = None,
+                           end: Optional[Union[date, datetime]] = None) -> int:
+        """Считает дни периодов в окне за O(log n) по префиксным суммам длин."""
+        start = None if start is None else self._to_day(start)
+        end = None if end is None else self._to_day(end)
+        periods = self.normalized_periods()
+        if self._prefix_days is None:
+            prefix = [0]
+            for period_start, period_end in periods:
+                prefix.append(prefix[-1] + (period_end - period_start).days + 1)
+            self._prefix_days = prefix
+        
+        lo, hi = self._window_bounds(start, end)
+        if lo == hi:
+            return 0
+        total = self._prefix_days[hi] - self._prefix_days[lo]
+        # Отрезаем части крайних периодов, выходящие за окно
+        if start is not None and periods[lo][0] < start:
+            total -= (start - periods[lo][0]).days
+        if end is not None and periods[hi - 1][1] > end:
+            total -= (periods[hi - 1][1] - end).days
+        return total
+    
+    def count_days(self, start: Optional[Union[date, datetime]] = None,
+                   end: Optional[Union[date, datetime]] = None) -> int:
+        """
+        Считает дни показа в окне [start, end] арифметически,
+        без создания дат: O(log n) по префиксным суммам длин периодов,
+        правила повторения - в замкнутой форме (дни, входящие и в период,
+        и в правило, учитываются один раз).
+        
+        Args:
+            start: Первая дата окна (None - с начала расписания)
+            end: Последняя дата окна включительно (None - до конца расписания)
+            
+        Returns:
+            int: Количество дней показа
+        """
+        total = self._count_period_days(start, end)
+        if not self.recurrences:
+            return total
+        
+        # Дни правил считаются только в промежутках между периодами окна,
+        # чтобы дни, входящие и в период, и в правило, не считать дважды
+        lo = None if start is None else self._to_day(start).toordinal()
+        hi = None if end is None else self._to_day(end).toordinal()
+        if lo is None:
+            lo = min(rule._first for rule in self.recurrences)
+        if hi is None:
+            hi = max(rule._last for rule in self.recurrences)
+        
+        gaps = []
+        current = lo
+        for start_date, end_date in self._window_periods(start, end):
+            if start_date.toordinal() > current:
+                gaps.append((current, start_date.toordinal() - 1))
+            current = max(current, end_date.toordinal() + 1)
+        if current <= hi:
+            gaps.append((current, hi))
+        
+        if len(self.recurrences) <= self.MAX_UNION_RULES:
+            terms = self._rule_union_terms()
+            total += sum(sign * rule.count(a, b) for a, b in gaps for sign, rule in terms)
+        else:
+            # Слишком много правил для 2^k слагаемых: сливаем их дни
+            for a, b in gaps:
+                merged = heapq.merge(*(rule.ordinals(a, b) for rule in self.recurrences))
+                total += sum(1 for _ in itertools.groupby(merged))
+        return total
+    
+    # Сколько правил считать по формуле включений-исключений (до 2^k - 1 слагаемых)
+    MAX_UNION_RULES = 8
+    
+    def _rule_union_terms(self) -> List[Tuple[int, "RecurrenceRule"]]:
+        """Слагаемые включений-исключений для правил фильма (кэшируются до изменения)."""
+        if self._union_terms is None:
+            self._union_terms = rule_union_terms(self.recurrences)
+        return self._union_terms
+    
+    def get_schedule_summary(self) -> str:
+        """
+        Возвращает текстовое описание расписания.
+        Результат кэшируется до следующего изменения расписания.
+        
+        Returns:
+            str: Описание расписания
+        """
+        if self._summary_cache is None:
+            self._summary_cache = "\n".join(self._render_summary_lines())
+        return self._summary_cache
+    
+    def _render_summary_lines(self) -> Iterator[str]:
+        """Строки описания расписания (без кэширования)."""
+        if not self.schedule_periods and not self.recurrences:
+            yield "Нет запланированных показов"
+            return
+        
+        # Пересекающиеся и соседние периоды выводятся как один
+        for i, (start, end) in enumerate(self.normalized_periods(), 1):
+            days_count = (end - start).days + 1
+            yield (
+                f"Период {i}: {format_day(start.toordinal())} - {format_day(end.toordinal())} "
+                f"({days_count} {self._pluralize_days(days_count)})"
+            )
+        for i, rule in enumerate(self.recurrences, 1):
+            days_count = rule.count()
+            yield f"Правило {i}: {rule} ({days_count} {self._pluralize_days(days_count)})"
+    
+    @staticmethod
+    def _pluralize_days(n: int) -> str:
+        """Склонение слова 'день'."""
+        if n % 10 == 1 and n % 100 != 11:
+            return "день"
+        elif 2 <= n % 10 <= 4 and (n % 100 < 10 or n % 100 >= 20):
+            return "дня"
+        else:
+            return "дней"
+    
+    def __str__(self) -> str:
+        """Строковое представление фильма (кэшируется до изменения расписания или названия)."""
+        if self._str_cache is None or self._str_cache[0] != self.title:
+            self._str_cache = (self.title, self._render_title())
+        return self._str_cache[1]
+    
+    def _render_title(self) -> str:
+        """Строковое представление фильма (без кэширования)."""
+        periods = self.normalized_periods()
+        periods_count = len(periods)
+        rules_count = len(self.recurrences)
+        if periods_count == 0 and rules_count == 0:
+            periods_str = "нет периодов"
+        else:
+            total_days = self.count_days()
+            periods_str = f"{periods_count} {self._pluralize_periods(periods_count)}"
+            if rules_count:
+                periods_str += f", {rules_count} {self._pluralize_rules(rules_count)}"
+            periods_str += f", всего {total_days} {self._pluralize_days(total_days)}"
+        
+        return f"Фильм '{self.title}' ({periods_str})"
+    
+    @staticmethod
+    def _pluralize_periods(n: int) -> str:
+        """Склонение слова 'период'."""
+        if n % 10 == 1 and n % 100 != 11:
+            return "период"
+        elif 2 <= n % 10 <= 4 and (n % 100 < 10 or n % 100 >= 20):
+            return "периода"
+        else:
+            return "периодов"
+    
+    @staticmethod
+    def _pluralize_rules(n: int) -> str:
+        """Склонение слова 'правило'."""
+        if n % 10 == 1 and n % 100 != 11:
+            return "правило"
+        elif 2 <= n % 10 <= 4 and (n % 100 < 10 or n % 100 >= 20):
+            return "правила"
+        else:
+            return "правил"
+
+
+WEEKDAY_NAMES = ('пн', 'вт', 'ср', 'чт', 'пт', 'сб', 'вс')
+
+
+class RecurrenceRule:
+    """
+    Правило повторения показов, хранящееся символически.
+    
+    День d из отрезка [start_date, end_date] входит в расписание, если:
+    - его день недели входит в weekdays (0 - понедельник), если маска задана;
+    - его число месяца лежит в month_days = (первое, последнее), если задано;
+    - он отстоит от start_date на кратное interval число дней;
+    - его нет среди exclusions.
+    
+    Маска дней недели и интервал сводятся к набору остатков порядкового
+    номера дня (date.toordinal) по модулю period = НОК(7, interval),
+    поэтому количество дней считается в замкнутой форме (по месяцам,
+    а не по дням), а даты разворачиваются лениво - только подходящие.
+    """
+    
+    def __init__(self, start_date: Union[date, datetime], end_date: Union[date, datetime],
+                 weekdays: Optional[Iterable[int]] = None,
+                 month_days: Optional[Tuple[int, int]] = None,
+                 interval: int = 1,
+                 exclusions: Iterable[Union[date, datetime]] = ()):
+        """
+        Инициализация правила.
+        
+        Args:
+            start_date: Первая дата действия правила
+            end_date: Последняя дата действия правила
+            weekdays: Дни недели (0 - понедельник, 6 - воскресенье), None - любые
+            month_days: Диапазон чисел месяца (первое, последнее), None - любые
+            interval: Шаг в днях от start_date (1 - каждый день)
+            exclusions: Даты, исключённые из расписания
+            
+        Raises:
+            ValueError: Если параметры правила некорректны
+        """
+        start_date = Movie._to_day(start_date)
+        end_date = Movie._to_day(end_date)
+        if start_date > end_date:
+            raise ValueError(f"Дата начала {start_date} позже даты окончания {end_date}")
+        if weekdays is not None:
+            weekdays = frozenset(weekdays)
+            if not weekdays or not weekdays <= set(range(7)):
+                raise ValueError(f"Дни недели должны быть числами 0-6, получено {sorted(weekdays)}")
+        if month_days is not None and not 1 <= month_days[0] <= month_days[1] <= 31:
+            raise ValueError(f"Некорректный диапазон чисел месяца {month_days}")
+        if interval < 1:
+            raise ValueError(f"interval должен быть >= 1, получено {interval}")
+        
+        self.start_date = start_date
+        self.end_date = end_date
+        self.weekdays = weekdays
+        self.month_days = month_days
+        self.interval = interval
+        
+        first = start_date.toordinal()
+        period = interval if weekdays is None else interval * 7 // math.gcd(interval, 7)
+        residues = tuple(
+            r for r in range(period)
+            if (r - first) % interval == 0
+            and (weekdays is None or (r - 1) % 7 in weekdays)
+        )
+        self._init_pattern(first, end_date.toordinal(), period, residues, month_days)
+        self._set_exclusions(Movie._to_day(d).toordinal() for d in exclusions)
+    
+    def _init_pattern(self, first: int, last: int, period: int,
+                      residues: Tuple[int, ...], month_days: Optional[Tuple[int, int]]) -> None:
+        """Задаёт внутреннее представление: отрезок, остатки по модулю period и числа месяца."""
+        self._first = first
+        self._last = last
+        self._period = period
+        self._residues = residues
+        self._residue_set = frozenset(residues)
+        self._month_days = month_days
+    
+    def _set_exclusions(self, ordinals: Iterable[int]) -> None:
+        """Сохраняет только те исключения, которые иначе попали бы в расписание."""
+        self._exclusions = sorted(set(o for o in ordinals if self._matches_pattern(o)))
+        self._exclusion_set = frozenset(self._exclusions)
+    
+    def _matches_pattern(self, ordinal: int) -> bool:
+        """Проверяет день без учёта исключений."""
+        if not self._first <= ordinal <= self._last:
+            return False
+        if ordinal % self._period not in self._residue_set:
+            return False
+        if self._month_days is not None:
+            day = date.fromordinal(ordinal).day
+            return self._month_days[0] <= day <= self._month_days[1]
+        return True
+    
+    def contains(self, day: Union[date, datetime]) -> bool:
+        """
+        Проверяет, входит ли день в расписание правила, за O(1).
+        
+        Args:
+            day: Дата
+            
+        Returns:
+            bool: True, если день входит в правило
+        """
+        ordinal = day.toordinal()
+        return self._matches_pattern(ordinal) and ordinal not in self._exclusion_set
+    
+    def _segments(self, lo: Optional[int], hi: Optional[int]) -> List[Tuple[int, int]]:
+        """
+        Разбивает окно [lo, hi] (порядковые номера дней) на отрезки,
+        в которых не нужно проверять числа месяца.
+        """
+        lo = self._first if lo is None else max(lo, self._first)
+        hi = self._last if hi is None else min(hi, self._last)
+        if lo > hi:
+            return []
+        if self._month_days is None:
+            return [(lo, hi)]
+        
+        first_day, last_day = self._month_days
+        segments = []
+        current = date.fromordinal(lo).replace(day=1)
+        while current.toordinal() <= hi:
+            month_start = current.toordinal()
+            month_length = calendar.monthrange(current.year, current.month)[1]
+            a = max(lo, month_start + first_day - 1)
+            b = min(hi, month_start + min(last_day, month_length) - 1)
+            if a <= b:
+                segments.append((a, b))
+            current = (current + timedelta(days=32)).replace(day=1)
+        return segments
+    
+    def _count_residues(self, lo: int, hi: int) -> int:
+        """Количество дней в [lo, hi] с подходящим остатком - в замкнутой форме."""
+        period, residues = self._period, self._residues
+        full, rest = divmod(hi - lo + 1, period)
+        count = full * len(residues)
+        if rest:
+            a = lo % period
+            b = a + rest - 1
+            if b < period:
+                count += bisect.bisect_right(residues, b) - bisect.bisect_left(residues, a)
+            else:
+                count += len(residues) - bisect.bisect_left(residues, a)
+                count += bisect.bisect_right(residues, b - period)
+        return count
+    
+    def count(self, lo: Optional[int] = None, hi: Optional[int] = None) -> int:
+        """
+        Считает дни правила в окне без перебора дней.
+        
+        Args:
+            lo: Первый порядковый номер дня окна (None - с начала правила)
+            hi: Последний порядковый номер дня окна (None - до конца правила)
+            
+        Returns:
+            int: Количество дней
+        """
+        total = sum(self._count_residues(a, b) for a, b in self._segments(lo, hi))
+        lo = self._first if lo is None else lo
+        hi = self._last if hi is None else hi
+        excluded = bisect.bisect_right(self._exclusions, hi) - bisect.bisect_left(self._exclusions, lo)
+        return total - max(0, excluded)
+    
+    def ordinals(self, lo: Optional[int] = None, hi: Optional[int] = None,
+                 reverse: bool = False) -> Iterator[int]:
+        """
+        Лениво разворачивает правило в порядковые номера дней.
+        Перебираются только подходящие остатки, а не все дни подряд.
+        
+        Args:
+            lo: Первый порядковый номер дня окна (None - с начала правила)
+            hi: Последний порядковый номер дня окна (None - до конца правила)
+            reverse: Выдавать дни в обратном порядке
+            
+        Yields:
+            int: Порядковый номер дня (date.toordinal)
+        """
+        period, residues, excluded = self._period, self._residues, self._exclusion_set
+        if not residues:
+            return
+        segments = self._segments(lo, hi)
+        
+        for a, b in (reversed(segments) if reverse else segments):
+            if reverse:
+                base = b - b % period
+                i = bisect.bisect_right(residues, b % period) - 1
+                while True:
+                    if i < 0:
+                        base -= period
+                        i = len(residues) - 1
+                    ordinal = base + residues[i]
+                    if ordinal < a:
+                        break
+                    if ordinal not in excluded:
+                        yield ordinal
+                    i -= 1
+            else:
+                base = a - a % period
+                i = bisect.bisect_left(residues, a % period)
+                while True:
+                    if i == len(residues):
+                        base += period
+                        i = 0
+                    ordinal = base + residues[i]
+                    if ordinal > b:
+                        break
+                    if ordinal not in excluded:
+                        yield ordinal
+                    i += 1
+    
+    def _intersect(self, other: "RecurrenceRule") -> Optional["RecurrenceRule"]:
+        """
+        Правило, содержащее дни, входящие в оба правила (None - если таких нет).
+        Используется для подсчёта объединения правил по формуле включений-исключений.
+        """
+        first = max(self._first, other._first)
+        last = min(self._last, other._last)
+        month_days = self._month_days or other._month_days
+        if self._month_days and other._month_days:
+            month_days = (max(self._month_days[0], other._month_days[0]),
+                          min(self._month_days[1], other._month_days[1]))
+            if month_days[0] > month_days[1]:
+                return None
+        if first > last:
+            return None
+        
+        period = self._period * other._period // math.gcd(self._period, other._period)
+        residues = tuple(
+            r for r in range(period)
+            if r % self._period in self._residue_set and r % other._period in other._residue_set
+        )
+        result = RecurrenceRule.__new__(RecurrenceRule)
+        result.start_date = datetime.fromordinal(first)
+        result.end_date = datetime.fromordinal(last)
+        result.weekdays = None
+        result.month_days = month_days
+        result.interval = None
+        result._init_pattern(first, last, period, residues, month_days)
+        result._set_exclusions(self._exclusions + other._exclusions)
+        return result
+    
+    def __str__(self) -> str:
+        """Строковое описание правила."""
+        parts = []
+        if self.weekdays is not None:
+            parts.append(", ".join(WEEKDAY_NAMES[d] for d in sorted(self.weekdays)))
+        if self.month_days is not None:
+            parts.append(f"числа {self.month_days[0]}-{self.month_days[1]}")
+        if self.interval and self.interval > 1:
+            parts.append(f"каждые {self.interval} дн.")
+        if not parts:
+            parts.append("ежедневно")
+        parts.append(f"{format_day(self._first)} - {format_day(self._last)}")
+        if self._exclusions:
+            parts.append(f"исключений: {len(self._exclusions)}")
+        return "; ".join(parts)
+
+
+def rule_union_terms(rules: List[RecurrenceRule]) -> List[Tuple[int, RecurrenceRule]]:
+    """
+    Слагаемые формулы включений-исключений для объединения правил:
+    пары (знак, пересечение подмножества правил). Пустые пересечения
+    отбрасываются вместе со всеми их надмножествами, но в худшем случае
+    слагаемых 2^k - 1, поэтому Movie переходит к перебору дней,
+    если правил больше Movie.MAX_UNION_RULES.
+    
+    Args:
+        rules: Правила
+        
+    Returns:
+        List[Tuple[int, RecurrenceRule]]: Слагаемые со знаком +1 или -1
+    """
+    terms: List[Tuple[int, RecurrenceRule]] = []
+    
+    def visit(start: int, current: Optional[RecurrenceRule], size: int) -> None:
+        for i in range(start, len(rules)):
+            rule = rules[i] if current is None else current._intersect(rules[i])
+            if rule is None or rule.count() == 0:
+                continue
+            # Подмножества нечётного размера прибавляются, чётного - вычитаются
+            terms.append((1 if size % 2 == 0 else -1, rule))
+            visit(i + 1, rule, size + 1)
+    
+    visit(0, None, 0)
+    return terms
+
+
+def count_rules_union(rules: List[RecurrenceRule], lo: Optional[int] = None,
+                      hi: Optional[int] = None) -> int:
+    """
+    Считает дни, входящие хотя бы в одно правило, по формуле
+    включений-исключений над пересечениями правил (без перебора дней).
+    Сложность растёт как 2^k по числу правил k, поэтому рассчитана
+    на небольшое число правил у одного фильма.
+    
+    Args:
+        rules: Правила
+        lo: Первый порядковый номер дня окна (None - без ограничения)
+        hi: Последний порядковый номер дня окна (None - без ограничения)
+        
+    Returns:
+        int: Количество дней
+    """
+    return sum(sign * rule.count(lo, hi) for sign, rule in rule_union_terms(rules))
+
+
+class CompactMovie:
+    """
+    Компактный вариант Movie для миллионов живых объектов.
+    
+    Вместо __dict__ используются __slots__, а периоды хранятся в двух
+    параллельных столбцах array('i') с порядковыми номерами дат
+    (date.toordinal) вместо списка кортежей (datetime, datetime).
+    Время суток не хранится: даты показа - это полночь соответствующего дня.
+    """
+    
+    __slots__ = ('title', '_starts', '_ends')
+    
+    # Правила повторения не поддерживаются
+    recurrences: Tuple["RecurrenceRule", ...] = ()
+    
+    def __init__(self, title: str):
+        """
+        Инициализация фильма.
+        
+        Args:
+            title: Название фильма
+        """
+        self.title = title
+        self._starts = array('i')
+        self._ends = array('i')
+    
+    def add_schedule_period(self, start_date: datetime, end_date: datetime) -> None:
+        """
+        Добавляет период показа фильма, сохраняя сортировку по дате начала.
+        
+        Args:
+            start_date: Дата начала показа
+            end_date: Дата окончания показа
+            
+        Raises:
+            ValueError: Если дата начала позже даты окончания
+        """
+        if start_date > end_date:
+            raise ValueError(f"Дата начала {start_date} позже даты окончания {end_date}")
+        
+        start = start_date.toordinal()
+        # bisect_right сохраняет порядок добавления при равных датах начала, как sort()
+        position = bisect.bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._ends.insert(position, end_date.toordinal())
+    
+    @property
+    def schedule_periods(self) -> List[Tuple[datetime, datetime]]:
+        """Периоды показа в формате Movie.schedule_periods."""
+        return [
+            (datetime.fromordinal(start), datetime.fromordinal(end))
+            for start, end in zip(self._starts, self._ends)
+        ]
+    
+    def normalized_periods(self) -> List[Period]:
+        """Периоды с объединёнными пересечениями (см. Movie.normalized_periods)."""
+        return normalize_periods(self.schedule_periods)
+    
+    def schedule(self) -> Generator[datetime, None, None]:
+        """
+        Генератор, возвращающий все дни показа фильма по порядку.
+        Дни из пересекающихся периодов возвращаются один раз.
+        
+        Yields:
+            datetime: Следующая дата показа
+        """
+        last = None
+        for start, end in zip(self._starts, self._ends):
+            if last is not None and start <= last:
+                start = last + 1
+            for ordinal in range(start, end + 1):
+                yield datetime.fromordinal(ordinal)
+            if last is None or end > last:
+                last = end
+    
+    def count_days(self) -> int:
+        """Общее число дней показа (без учёта пересечений периодов)."""
+        return count_period_days(self.normalized_periods())
+    
+    def get_schedule_summary(self) -> str:
+        """Текстовое описание расписания (без кэширования - у объекта нет __dict__)."""
+        return "\n".join(self._render_summary_lines())
+    
+    # Форматирование совпадает с Movie
+    _render_summary_lines = Movie._render_summary_lines
+    __str__ = Movie._render_title
+    _pluralize_days = staticmethod(Movie._pluralize_days)
+    _pluralize_periods = staticmethod(Movie._pluralize_periods)
+
+
+def _measure_per_object(factory, count: int) -> float:
+    """
+    Измеряет через tracemalloc средний объём памяти на один объект.
+    
+    Args:
+        factory: Функция от номера объекта, создающая объект
+        count: Количество объектов
+        
+    Returns:
+        float: Байт на объект
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory(i) for i in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def memory_report_movies(count: int = 10 ** 6, periods: int = 3) -> None:
+    """
+    Сравнивает память на объект для Movie и CompactMovie.
+    
+    Args:
+        count: Количество живых фильмов
+        periods: Количество периодов у каждого фильма
+    """
+    def build(movie_class, title: str):
+        movie = movie_class(title)
+        for month in range(1, periods + 1):
+            movie.add_schedule_period(datetime(2025, month, 10), datetime(2025, month, 15))
+        return movie
+    
+    # Названия создаются до замера, чтобы учитывать только сами объекты
+    titles = [f"Фильм {i}" for i in range(count)]
+    regular = _measure_per_object(lambda i: build(Movie, titles[i]), count)
+    compact = _measure_per_object(lambda i: build(CompactMovie, titles[i]), count)
+    
+    print(f"\nПамять на фильм ({periods} периода) при {count:,} объектах:")
+    print(f"  Movie:        {regular:8.1f} байт")
+    print(f"  CompactMovie: {compact:8.1f} байт")
+    print(f"  Экономия: {regular - compact:.1f} байт ({regular / compact:.1f}x)")
+
+
+class MovieCatalog:
+    """
+    Каталог фильмов сети кинотеатров.
+    
+    Хранит инвертированный индекс "дата -> фильмы" в виде отсортированных
+    границ отрезков, на каждом из которых состав фильмов не меняется.
+    Индекс обновляется инкрементально при добавлении периода любому
+    фильму каталога, а запрос на день стоит O(log n + k).
+    Правила повторения хранятся отдельным списком и проверяются
+    за O(1) каждое (RecurrenceRule.contains).
+    """
+    
+    def __init__(self, movies: Iterable[Movie] = ()):
+        """
+        Инициализация каталога.
+        
+        Args:
+            movies: Начальные фильмы
+        """
+        self.movies: List[Movie] = []
+        # Отрезок i: [_bounds[i], _bounds[i + 1]) с фильмами _segments[i]
+        self._bounds: List[datetime] = []
+        self._segments: List[Set[Movie]] = []
+        self._recurring: List[Tuple[Movie, RecurrenceRule]] = []
+        self._by_title: Dict[str, Movie] = {}
+        # Номер версии каталога: растёт при любом изменении расписаний
+        self.version = 0
+        for movie in movies:
+            self.add_movie(movie)
+    
+    def add_movie(self, movie: Movie) -> None:
         """
-        Инициализация фильма.
+        Добавляет фильм в каталог и индексирует его периоды.
         
         Args:
-            title: Название фильма
+            movie: Фильм
         """
-        self.title = title
-        self.schedule_periods: List[Tuple[datetime, datetime]] = []
+        self.movies.append(movie)
+        self._by_title.setdefault(movie.title, movie)
+        self.version += 1
+        for period in movie.normalized_periods():
+            self._on_change(movie, period)
+        for rule in movie.recurrences:
+            self._on_change(movie, rule)
+        movie.add_listener(self._on_change)
     
-    def add_schedule_period(self, start_date: datetime, end_date: datetime) -> None:
+    def get(self, title: str) -> Optional[Movie]:
         """
-        Добавляет период показа фильма.
+        Возвращает фильм по названию (первый добавленный с таким названием).
         
         Args:
-            start_date: Дата начала показа
-            end_date: Дата окончания показа
+            title: Название фильма
             
-        Raises:
-            ValueError: Если дата начала позже даты окончания
+        Returns:
+            Optional[Movie]: Фильм или None
         """
-        if start_date > end_date:
-            raise ValueError(f"Дата начала {start_date} позже даты окончания {end_date}")
+        return self._by_title.get(title)
+    
+    def _split(self, point: datetime) -> int:
+        """Разбивает отрезок в точке point и возвращает индекс отрезка, начинающегося в ней."""
+        i = bisect.bisect_left(self._bounds, point)
+        if i < len(self._bounds) and self._bounds[i] == point:
+            return i
+        self._bounds.insert(i, point)
+        self._segments.insert(i, set(self._segments[i - 1]) if i else set())
+        return i
+    
+    def _on_change(self, movie: Movie, item: Union[Period, RecurrenceRule]) -> None:
+        """Индексирует добавленный фильму период или правило."""
+        self.version += 1
+        if isinstance(item, RecurrenceRule):
+            self._recurring.append((movie, item))
+        else:
+            self._index_period(movie, *item)
+    
+    def _index_period(self, movie: Movie, start_date: datetime, end_date: datetime) -> None:
+        """Добавляет фильм во все отрезки индекса внутри периода."""
+        first = self._split(Movie._to_day(start_date))
+        last = self._split(Movie._to_day(end_date) + ONE_DAY)
+        for i in range(first, last):
+            self._segments[i].add(movie)
+    
+    def whats_on(self, day: Union[date, datetime]) -> List[str]:
+        """
+        Возвращает названия фильмов, идущих в указанный день.
         
-        self.schedule_periods.append((start_date, end_date))
-        # Сортируем периоды по дате начала
-        self.schedule_periods.sort(key=lambda x: x[0])
+        Args:
+            day: Дата
+            
+        Returns:
+            List[str]: Названия фильмов в алфавитном порядке
+        """
+        day = Movie._to_day(day)
+        i = bisect.bisect_right(self._bounds, day) - 1
+        movies = set(self._segments[i]) if i >= 0 else set()
+        movies.update(movie for movie, rule in self._recurring if rule.contains(day))
+        return sorted(movie.title for movie in movies)
     
-    def schedule(self) -> Generator[datetime, None, None]:
+    def timeline(self) -> Iterator[Tuple[datetime, List[str]]]:
         """
-        Генератор, возвращающий все дни показа фильма по порядку.
+        Ленивая общая хронология показов всех фильмов каталога.
+        Границы периодов всех фильмов сливаются через кучу (heapq.merge),
+        поэтому расписания фильмов не разворачиваются заранее.
         
         Yields:
-            datetime: Следующая дата показа
+            Tuple[datetime, List[str]]: День и названия идущих в этот день фильмов
         """
-        for start_date, end_date in self.schedule_periods:
-            current_date = start_date
-            while current_date <= end_date:
-                yield current_date
-                current_date += timedelta(days=1)
+        # При совпадении дат окончание (0) обрабатывается раньше начала (1)
+        def period_boundaries(order: int, movie: Movie):
+            for start_date, end_date in movie.normalized_periods():
+                yield (start_date, 1, order, movie)
+                yield (end_date + ONE_DAY, 0, order, movie)
+        
+        def rule_boundaries(order: int, movie: Movie, rule: RecurrenceRule):
+            # Правило разворачивается лениво, по одному дню
+            for ordinal in rule.ordinals():
+                yield (datetime.fromordinal(ordinal), 1, order, movie)
+                yield (datetime.fromordinal(ordinal + 1), 0, order, movie)
+        
+        streams = []
+        for order, movie in enumerate(self.movies):
+            streams.append(period_boundaries(order, movie))
+            streams.extend(rule_boundaries(order, movie, rule) for rule in movie.recurrences)
+        
+        # Счётчик на фильм: дни периода и правила одного фильма могут совпадать
+        active: Dict[int, int] = {}
+        current: Optional[datetime] = None
+        for point, kind, order, movie in heapq.merge(*streams):
+            if active and current is not None and point > current:
+                titles = sorted(self.movies[i].title for i in active)
+                while current < point:
+                    yield current, titles
+                    current += ONE_DAY
+            if kind:
+                active[order] = active.get(order, 0) + 1
+            elif active[order] == 1:
+                del active[order]
+            else:
+                active[order] -= 1
+            current = point
+
+
+def generate_movies(count: int, periods: int = 4, seed: int = 0,
+                    base: datetime = datetime(2025, 1, 1)) -> List[Movie]:
+    """
+    Создаёт воспроизводимый набор фильмов для замеров и демонстраций:
+    у каждого фильма periods периодов длиной 3-20 дней примерно раз в месяц.
     
-    def get_schedule_summary(self) -> str:
+    Args:
+        count: Количество фильмов
+        periods: Количество периодов у фильма
+        seed: Начальное значение генератора случайных чисел
+        base: Дата, от которой отсчитываются периоды
+        
+    Returns:
+        List[Movie]: Фильмы
+    """
+    rng = random.Random(seed)
+    movies = []
+    for i in range(count):
+        movie = Movie(f"Фильм {i}")
+        starts = (base + timedelta(days=30 * k + rng.randrange(10)) for k in range(periods))
+        movie.add_schedule_periods((start, start + timedelta(days=rng.randint(2, 19))) for start in starts)
+        movies.append(movie)
+    return movies
+
+
+def load_catalog(path: str) -> List[Movie]:
+    """
+    Загружает фильмы из файла в формате по расширению:
+    .csv, .jsonl или бинарный колоночный формат (любое другое расширение).
+    
+    Args:
+        path: Путь к файлу
+        
+    Returns:
+        List[Movie]: Фильмы
+    """
+    if path.endswith('.csv'):
+        return load_catalog_csv(path)
+    if path.endswith('.jsonl'):
+        return load_catalog_jsonl(path)
+    with ColumnarCatalog(path) as catalog:
+        return list(catalog)
+
+
+def movies_from_records(records: Iterable[Tuple[str, datetime, datetime]]) -> List[Movie]:
+    """
+    Собирает фильмы из потока записей (название, начало, конец).
+    Периоды копятся по названию и вставляются в фильм одной пачкой
+    (одна сортировка на фильм). Порядок фильмов - по первому появлению.
+    
+    Args:
+        records: Записи периодов
+        
+    Returns:
+        List[Movie]: Фильмы
+    """
+    grouped: Dict[str, List[Period]] = {}
+    for title, start_date, end_date in records:
+        grouped.setdefault(title, []).append((start_date, end_date))
+    
+    movies = []
+    for title, periods in grouped.items():
+        movie = Movie(title)
+        movie.add_schedule_periods(periods)
+        movies.append(movie)
+    return movies
+
+
+def iter_csv_records(stream) -> Iterator[Tuple[str, datetime, datetime]]:
+    """
+    Потоково читает CSV с колонками title,start,end (даты в формате ISO).
+    
+    Args:
+        stream: Текстовый поток
+        
+    Yields:
+        Tuple[str, datetime, datetime]: Название и период
+    """
+    parse = datetime.fromisoformat
+    for row in csv.DictReader(stream):
+        yield row['title'], parse(row['start']), parse(row['end'])
+
+
+def iter_jsonl_records(stream) -> Iterator[Tuple[str, datetime, datetime]]:
+    """
+    Потоково читает JSONL: одна строка на фильм,
+    {"title": ..., "periods": [["YYYY-MM-DD", "YYYY-MM-DD"], ...]}.
+    
+    Args:
+        stream: Текстовый поток
+        
+    Yields:
+        Tuple[str, datetime, datetime]: Название и период
+    """
+    parse = datetime.fromisoformat
+    for line in stream:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        for start, end in record['periods']:
+            yield record['title'], parse(start), parse(end)
+
+
+def load_catalog_csv(path: str) -> List[Movie]:
+    """Загружает фильмы из CSV-файла (см. iter_csv_records)."""
+    with open(path, encoding='utf-8', newline='') as f:
+        return movies_from_records(iter_csv_records(f))
+
+
+def load_catalog_jsonl(path: str) -> List[Movie]:
+    """Загружает фильмы из JSONL-файла (см. iter_jsonl_records)."""
+    with open(path, encoding='utf-8') as f:
+        return movies_from_records(iter_jsonl_records(f))
+
+
+def save_catalog_csv(movies: Iterable[Movie], path: str) -> None:
+    """
+    Потоково записывает периоды фильмов в CSV (строка на период).
+    Правила повторения в файл не попадают.
+    
+    Args:
+        movies: Фильмы
+        path: Путь к файлу
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('title', 'start', 'end'))
+        for movie in movies:
+            writer.writerows(
+                (movie.title, start.date().isoformat(), end.date().isoformat())
+                for start, end in movie.schedule_periods
+            )
+
+
+def save_catalog_jsonl(movies: Iterable[Movie], path: str) -> None:
+    """
+    Потоково записывает фильмы в JSONL (строка на фильм).
+    Правила повторения в файл не попадают.
+    
+    Args:
+        movies: Фильмы
+        path: Путь к файлу
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for movie in movies:
+            periods = [[start.date().isoformat(), end.date().isoformat()]
+                       for start, end in movie.schedule_periods]
+            f.write(json.dumps({'title': movie.title, 'periods': periods}, ensure_ascii=False))
+            f.write('\n')
+
+
+# Бинарный колоночный формат каталога:
+#   заголовок: сигнатура, версия, порядок байт, число фильмов, число периодов, размер названий;
+#   смещения названий (uint64, фильмов + 1) и периодов (uint64, фильмов + 1);
+#   даты начала и окончания (int32, порядковые номера дней date.toordinal);
+#   названия в UTF-8 подряд.
+_CATALOG_MAGIC = b'MOVIECAT'
+_CATALOG_VERSION = 1
+_CATALOG_HEADER = struct.Struct('<8sHHIQQ')
+
+
+def save_catalog_binary(movies: Iterable[Movie], path: str) -> None:
+    """
+    Записывает фильмы в бинарный колоночный формат, пригодный
+    для отображения в память (см. ColumnarCatalog).
+    Правила повторения в файл не попадают.
+    
+    Args:
+        movies: Фильмы
+        path: Путь к файлу
+    """
+    title_offsets = array('Q', [0])
+    period_offsets = array('Q', [0])
+    starts = array('i')
+    ends = array('i')
+    titles = bytearray()
+    
+    for movie in movies:
+        titles += movie.title.encode('utf-8')
+        title_offsets.append(len(titles))
+        for start, end in movie.schedule_periods:
+            starts.append(start.toordinal())
+            ends.append(end.toordinal())
+        period_offsets.append(len(starts))
+    
+    byteorder = 0 if sys.byteorder == 'little' else 1
+    with open(path, 'wb') as f:
+        f.write(_CATALOG_HEADER.pack(_CATALOG_MAGIC, _CATALOG_VERSION, byteorder,
+                                     len(title_offsets) - 1, len(starts), len(titles)))
+        for column in (title_offsets, period_offsets, starts, ends):
+            column.tofile(f)
+        f.write(titles)
+
+
+class ColumnarCatalog:
+    """
+    Каталог в бинарном колоночном формате, отображённый в память.
+    
+    Открытие не разбирает файл: столбцы становятся представлениями
+    memoryview над mmap, а фильмы собираются только при обращении.
+    """
+    
+    def __init__(self, path: str):
         """
-        Возвращает текстовое описание расписания.
+        Отображает файл каталога в память.
+        
+        Args:
+            path: Путь к файлу, созданному save_catalog_binary
+            
+        Raises:
+            ValueError: Если файл не является каталогом или записан с другим порядком байт
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, byteorder, movies, periods, titles_size = \
+            _CATALOG_HEADER.unpack_from(self._mmap)
+        if magic != _CATALOG_MAGIC or version != _CATALOG_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Файл {path} не является каталогом фильмов")
+        if byteorder != (0 if sys.byteorder == 'little' else 1):
+            self._mmap.close()
+            raise ValueError("Каталог записан на машине с другим порядком байт")
+        
+        view = memoryview(self._mmap)
+        offset = _CATALOG_HEADER.size
         
+        def column(typecode: str, count: int) -> memoryview:
+            nonlocal offset
+            size = count * array(typecode).itemsize
+            result = view[offset:offset + size].cast(typecode)
+            offset += size
+            return result
+        
+        self._title_offsets = column('Q', movies + 1)
+        self._period_offsets = column('Q', movies + 1)
+        self._starts = column('i', periods)
+        self._ends = column('i', periods)
+        self._titles = view[offset:offset + titles_size]
+        self._view = view
+    
+    def __len__(self) -> int:
+        return len(self._title_offsets) - 1
+    
+    def title(self, i: int) -> str:
+        """Название i-го фильма."""
+        return str(self._titles[self._title_offsets[i]:self._title_offsets[i + 1]], 'utf-8')
+    
+    def periods(self, i: int) -> List[Period]:
+        """Периоды i-го фильма."""
+        lo, hi = self._period_offsets[i], self._period_offsets[i + 1]
+        return [
+            (datetime.fromordinal(start), datetime.fromordinal(end))
+            for start, end in zip(self._starts[lo:hi], self._ends[lo:hi])
+        ]
+    
+    def movie(self, i: int) -> Movie:
+        """
+        Собирает объект Movie для i-го фильма.
+        
+        Args:
+            i: Номер фильма
+            
         Returns:
-            str: Описание расписания
+            Movie: Фильм
+        """
+        if not 0 <= i < len(self):
+            raise IndexError(f"Фильм {i} вне каталога из {len(self)} фильмов")
+        movie = Movie(self.title(i))
+        movie.add_schedule_periods(self.periods(i))
+        return movie
+    
+    def __iter__(self) -> Iterator[Movie]:
+        return (self.movie(i) for i in range(len(self)))
+    
+    def close(self) -> None:
+        """Освобождает представления и закрывает отображение файла."""
+        for column in (self._title_offsets, self._period_offsets,
+                       self._starts, self._ends, self._titles, self._view):
+            column.release()
+        self._mmap.close()
+    
+    def __enter__(self) -> "ColumnarCatalog":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ReportWriter:
+    """
+    Буферизованная потоковая запись отчёта.
+    Строки копятся в списке ограниченного размера и сбрасываются
+    в поток порциями, поэтому весь отчёт никогда не собирается в одну строку.
+    """
+    
+    def __init__(self, stream, buffer_size: int = 1 << 16):
         """
-        if not self.schedule_periods:
-            return "Нет запланированных показов"
+        Args:
+            stream: Текстовый поток для записи
+            buffer_size: Размер порции в символах
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._parts: List[str] = []
+        self._size = 0
+    
+    def write(self, text: str) -> None:
+        """Добавляет текст в буфер, сбрасывая его при заполнении."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Записывает накопленный текст в поток."""
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+    
+    def __enter__(self) -> "ReportWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+
+
+def write_report(movies: Iterable[Movie], stream, buffer_size: int = 1 << 16) -> int:
+    """
+    Записывает отчёт по фильмам: строка фильма, описание расписания
+    и пустая строка. Отчёт пишется порциями, без склейки в одну строку.
+    
+    Args:
+        movies: Фильмы
+        stream: Текстовый поток
+        buffer_size: Размер порции буфера в символах
         
-        summary = []
-        for i, (start, end) in enumerate(self.schedule_periods, 1):
+    Returns:
+        int: Количество фильмов в отчёте
+    """
+    count = 0
+    with ReportWriter(stream, buffer_size) as writer:
+        for movie in movies:
+            writer.write(str(movie))
+            writer.write("\n")
+            # Описание берётся из кэша фильма и пересобирается только после изменений
+            writer.write(movie.get_schedule_summary())
+            writer.write("\n\n")
+            count += 1
+    return count
+
+
+def benchmark_report_export(count: int = 100_000) -> None:
+    """
+    Сравнивает выгрузку отчёта прежним способом (strftime, склейка
+    всего отчёта в одну строку) и через write_report.
+    
+    Args:
+        count: Количество фильмов
+    """
+    def legacy_pluralize(n: int, forms: Tuple[str, str, str]) -> str:
+        if n % 10 == 1 and n % 100 != 11:
+            return forms[0]
+        elif 2 <= n % 10 <= 4 and (n % 100 < 10 or n % 100 >= 20):
+            return forms[1]
+        return forms[2]
+    
+    def legacy_render(movie: Movie) -> str:
+        periods = movie.schedule_periods
+        days_forms = ("день", "дня", "дней")
+        total = sum((end - start).days + 1 for start, end in periods)
+        lines = [
+            f"Фильм '{movie.title}' ({len(periods)} "
+            f"{legacy_pluralize(len(periods), ('период', 'периода', 'периодов'))}, "
+            f"всего {total} {legacy_pluralize(total, days_forms)})"
+        ]
+        for i, (start, end) in enumerate(periods, 1):
             days_count = (end - start).days + 1
-            summary.append(
+            lines.append(
                 f"Период {i}: {start.strftime('%d.%m.%Y')} - {end.strftime('%d.%m.%Y')} "
-                f"({days_count} {self._pluralize_days(days_count)})"
+                f"({days_count} {legacy_pluralize(days_count, days_forms)})"
             )
-        return "\n".join(summary)
+        return "\n".join(lines)
     
-    @staticmethod
-    def _pluralize_days(n: int) -> str:
-        """Склонение слова 'день'."""
-        if n % 10 == 1 and n % 100 != 11:
-            return "день"
-        elif 2 <= n % 10 <= 4 and (n % 100 < 10 or n % 100 >= 20):
-            return "дня"
-        else:
-            return "дней"
+    movies = generate_movies(count)
     
-    def __str__(self) -> str:
-        """Строковое представление фильма."""
-        periods_count = len(self.schedule_periods)
-        if periods_count == 0:
-            periods_str = "нет периодов"
-        else:
-            total_days = sum((end - start).days + 1 for start, end in self.schedule_periods)
-            periods_str = f"{periods_count} {self._pluralize_periods(periods_count)}, всего {total_days} {self._pluralize_days(total_days)}"
+    started = time.perf_counter()
+    legacy = "\n\n".join(legacy_render(movie) for movie in movies)
+    legacy_time = time.perf_counter() - started
+    
+    output = io.StringIO()
+    started = time.perf_counter()
+    write_report(movies, output)
+    pipeline_time = time.perf_counter() - started
+    
+    print(f"\nВыгрузка отчёта по {count:,} фильмам ({len(legacy):,} символов):")
+    print(f"  Прежний способ: {legacy_time:.3f} с")
+    print(f"  write_report:   {pipeline_time:.3f} с ({legacy_time / pipeline_time:.2f}x)")
+
+
+class LRUCache:
+    """
+    Ограниченный кэш с вытеснением давно не использованных записей.
+    Устаревшие записи не удаляются явно: в ключ входит версия
+    расписания, поэтому после изменения они просто перестают
+    запрашиваться и вытесняются.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: Максимальное число записей (>= 1)
+            
+        Raises:
+            ValueError: Если maxsize < 1
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize должно быть >= 1, получено {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Возвращает значение из кэша или вычисляет и сохраняет его.
         
-        return f"Фильм '{self.title}' ({periods_str})"
+        Args:
+            key: Ключ
+            compute: Функция без аргументов, вычисляющая значение
+            
+        Returns:
+            Any: Значение
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = compute()
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
     
-    @staticmethod
-    def _pluralize_periods(n: int) -> str:
-        """Склонение слова 'период'."""
-        if n % 10 == 1 and n % 100 != 11:
-            return "период"
-        elif 2 <= n % 10 <= 4 and (n % 100 < 10 or n % 100 >= 20):
-            return "периода"
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ScheduleQueryService:
+    """
+    Асинхронный сервис запросов к расписанию каталога.
+    
+    Протокол - JSON по строкам (поверх TCP или stdin/stdout): на каждую
+    строку-запрос приходит строка-ответ с тем же "id".
+    
+    Запросы:
+        {"op": "is_showing", "title": ..., "date": "YYYY-MM-DD"} -> bool
+        {"op": "next", "title": ..., "after": "YYYY-MM-DD"} -> дата или null
+        {"op": "window", "title": ..., "start": ..., "end": ...} -> список дат
+        {"op": "day", "date": ...} -> список названий
+    
+    Дорогие развёртывания ("window", "day") проходят через LRU-кэш;
+    ключ содержит версию расписания фильма или каталога.
+    """
+    
+    def __init__(self, catalog: MovieCatalog, cache_size: int = 4096):
+        """
+        Args:
+            catalog: Каталог фильмов
+            cache_size: Размер LRU-кэша результатов
+        """
+        self.catalog = catalog
+        self.cache = LRUCache(cache_size)
+    
+    def _movie(self, request: Dict[str, Any]) -> Movie:
+        movie = self.catalog.get(request['title'])
+        if movie is None:
+            raise ValueError(f"Фильм {request['title']!r} не найден")
+        return movie
+    
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выполняет один запрос.
+        
+        Args:
+            request: Разобранный JSON-запрос
+            
+        Returns:
+            Dict[str, Any]: Ответ {"id", "result"} или {"id", "error"}
+        """
+        response: Dict[str, Any] = {'id': request.get('id')}
+        parse = date.fromisoformat
+        try:
+            op = request['op']
+            if op == 'is_showing':
+                result: Any = self._movie(request).is_showing(parse(request['date']))
+            elif op == 'next':
+                found = self._movie(request).next_showing(parse(request['after']))
+                result = found.date().isoformat() if found else None
+            elif op == 'window':
+                movie = self._movie(request)
+                start, end = parse(request['start']), parse(request['end'])
+                result = self.cache.get_or_compute(
+                    ('window', id(movie), movie.version, start, end),
+                    lambda: [day.isoformat() for day in movie.schedule(start, end, output='date')],
+                )
+            elif op == 'day':
+                day = parse(request['date'])
+                result = self.cache.get_or_compute(
+                    ('day', self.catalog.version, day),
+                    lambda: self.catalog.whats_on(day),
+                )
+            else:
+                raise ValueError(f"Неизвестная операция {op!r}")
+            response['result'] = result
+        except KeyError as e:
+            response['error'] = f"Отсутствует значение: {e.args[0]}" if e.args else "Отсутствует значение"
+        except (ValueError, TypeError, OverflowError) as e:
+            # OverflowError - например, "next" после 9999-12-31
+            response['error'] = str(e)
+        except Exception as e:
+            # Любая другая ошибка одного запроса не должна обрывать соединение
+            response['error'] = f"Внутренняя ошибка: {type(e).__name__}: {e}"
+        return response
+    
+    def handle_line(self, line: Union[bytes, str]) -> bytes:
+        """Обрабатывает строку запроса и возвращает строку ответа."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Запрос должен быть JSON-объектом")
+        except ValueError as e:
+            response = {'id': None, 'error': f"Некорректный запрос: {e}"}
         else:
-            return "периодов"
+            response = self.handle(request)
+        return json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+    
+    @staticmethod
+    def _error_line(message: str) -> bytes:
+        """Строка ответа с ошибкой для запроса, который не удалось разобрать."""
+        return json.dumps({'id': None, 'error': message}, ensure_ascii=False).encode('utf-8') + b'\n'
+    
+    def _safe_handle_line(self, line: Union[bytes, str]) -> bytes:
+        """handle_line, которая на любую ошибку отвечает строкой с "error"."""
+        try:
+            return self.handle_line(line)
+        except Exception as e:
+            return self._error_line(f"Внутренняя ошибка: {type(e).__name__}: {e}")
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Обслуживает одно TCP-соединение."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Строка длиннее лимита буфера: отвечаем ошибкой и читаем дальше
+                    writer.write(self._error_line("Некорректный запрос: слишком длинная строка"))
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+                writer.write(self._safe_handle_line(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def serve_tcp(self, host: str = '127.0.0.1', port: int = 8765):
+        """
+        Запускает TCP-сервер (каждое соединение обслуживается своей задачей).
+        
+        Args:
+            host: Адрес
+            port: Порт (0 - выбрать свободный)
+            
+        Returns:
+            asyncio.AbstractServer: Запущенный сервер
+        """
+        return await asyncio.start_server(self._handle_connection, host, port)
+    
+    async def serve_stdio(self) -> None:
+        """Обслуживает запросы из stdin, ответы пишутся в stdout."""
+        loop = asyncio.get_running_loop()
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
+            if not line:
+                break
+            sys.stdout.buffer.write(self._safe_handle_line(line))
+            sys.stdout.buffer.flush()
+
+
+async def run_load_generator(host: str, port: int, titles: List[str], clients: int = 32,
+                             requests_per_client: int = 500,
+                             start: date = date(2025, 1, 1), days: int = 150) -> Dict[str, float]:
+    """
+    Нагрузочный клиент: clients соединений отправляют случайные запросы
+    по очереди и замеряют задержку каждого ответа.
+    
+    Args:
+        host: Адрес сервера
+        port: Порт сервера
+        titles: Названия фильмов для запросов
+        clients: Количество одновременных соединений
+        requests_per_client: Запросов на соединение
+        start: Первая дата диапазона запросов
+        days: Длина диапазона дат
+        
+    Returns:
+        Dict[str, float]: p50 и p99 задержки в миллисекундах и запросов в секунду
+    """
+    latencies: List[float] = []
+    
+    async def client(seed: int) -> None:
+        rng = random.Random(seed)
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in range(requests_per_client):
+                day = start + timedelta(days=rng.randrange(days))
+                title = rng.choice(titles)
+                op = rng.choice(('is_showing', 'next', 'window', 'day'))
+                request = {'id': i, 'op': op, 'title': title, 'date': day.isoformat(),
+                           'after': day.isoformat(), 'start': day.isoformat(),
+                           'end': (day + timedelta(days=14)).isoformat()}
+                started = time.perf_counter()
+                writer.write(json.dumps(request).encode() + b'\n')
+                await writer.drain()
+                await reader.readline()
+                latencies.append(time.perf_counter() - started)
+        finally:
+            writer.close()
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(client(seed) for seed in range(clients)))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    stats = {
+        'p50_ms': latencies[int(0.50 * (len(latencies) - 1))] * 1000,
+        'p99_ms': latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        'rps': len(latencies) / elapsed,
+    }
+    print(f"\nНагрузка: {clients} соединений x {requests_per_client} запросов")
+    print(f"  p50: {stats['p50_ms']:.2f} мс, p99: {stats['p99_ms']:.2f} мс, {stats['rps']:,.0f} запросов/с")
+    return stats
+
+
+def benchmark_query_service(movies: int = 1000, clients: int = 32,
+                            requests_per_client: int = 500) -> None:
+    """
+    Запускает сервис в этом же процессе на свободном порту
+    и нагружает его run_load_generator.
+    
+    Args:
+        movies: Количество фильмов в каталоге
+        clients: Количество одновременных соединений
+        requests_per_client: Запросов на соединение
+    """
+    async def run() -> None:
+        catalog = MovieCatalog(generate_movies(movies))
+        service = ScheduleQueryService(catalog)
+        server = await service.serve_tcp('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            await run_load_generator('127.0.0.1', port, [m.title for m in catalog.movies],
+                                     clients, requests_per_client)
+        finally:
+            server.close()
+            await server.wait_closed()
+        cache = service.cache
+        print(f"  Кэш: {len(cache)} записей, попаданий {cache.hits}, промахов {cache.misses}")
+    
+    asyncio.run(run())
+
+
+async def _serve_forever(catalog: MovieCatalog, port: int) -> None:
+    """Запускает TCP-сервис и обслуживает запросы до остановки процесса."""
+    server = await ScheduleQueryService(catalog).serve_tcp('127.0.0.1', port)
+    print(f"Сервис расписаний: {len(catalog.movies)} фильмов, 127.0.0.1:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
 
 
 def create_demo_schedule() -> Movie:
@@ -168,9 +2123,20 @@ def demonstrate_with_n_months(n: int = 12):
     print(f"Создан {movie}")
     print(movie.get_schedule_summary())
     
+    # То же расписание одним правилом повторения: хранится символически,
+    # а число дней считается без перебора дат
+    rule_movie = Movie("Годовой киномарафон (правило)")
+    rule_movie.add_recurrence(RecurrenceRule(
+        datetime(current_year, 1, 1),
+        datetime(current_year, n, calendar.monthrange(current_year, n)[1]),
+        month_days=(10, 15),
+    ))
+    print(f"\nТо же расписание правилом: {rule_movie}")
+    print(rule_movie.get_schedule_summary())
+    
     # Выводим первые несколько дат из генератора
     print(f"\nПервые 20 дат показа:")
-    schedule_gen = movie.schedule()
+    schedule_gen = movie.schedule(output='date')
     for i in range(20):
         try:
             date = next(schedule_gen)
@@ -221,4 +2187,27 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python task3.py bench                   - замеры производительности
+    # python task3.py serve [КАТАЛОГ] [ПОРТ]  - TCP-сервис расписаний (JSON по строкам)
+    # python task3.py serve-stdio [КАТАЛОГ]   - тот же сервис через stdin/stdout
+    # python task3.py loadgen [ПОРТ] [КАТАЛОГ] - нагрузка на запущенный сервис
+    #                                           (без порта - на сервис в этом же процессе)
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else (None, [])
+    if command == 'bench':
+        memory_report_movies()
+        benchmark_report_export()
+        benchmark_query_service()
+    elif command in ('serve', 'serve-stdio'):
+        movies = load_catalog(args[0]) if args else generate_movies(1000)
+        if command == 'serve':
+            asyncio.run(_serve_forever(MovieCatalog(movies), int(args[1]) if len(args) > 1 else 8765))
+        else:
+            asyncio.run(ScheduleQueryService(MovieCatalog(movies)).serve_stdio())
+    elif command == 'loadgen':
+        if args:
+            movies = load_catalog(args[1]) if len(args) > 1 else generate_movies(1000)
+            asyncio.run(run_load_generator('127.0.0.1', int(args[0]), [m.title for m in movies]))
+        else:
+            benchmark_query_service()
+    else:
+        main()
\ No newline at end of file
@@ -7,8 +7,135 @@
 Используется инструкция yield.
 """
 
-from typing import Generator, List
+from typing import Generator, List, Tuple, Dict, Iterable, Optional
+from array import array
+from collections import OrderedDict
+import itertools
 import sys
+import threading
+
+
+class FibonacciCache:
+    """
+    Ограниченный кэш контрольных точек быстрого удвоения k -> (F(k), F(k + 1)).
+    Размер ограничен бюджетом в байтах, при переполнении вытесняются
+    давно не использованные пары (LRU). Какие точки сохранять, решает
+    FibonacciSequence (параметр stride).
+    
+    Любой объект с методами lookup, put, clear и stats может заменить
+    этот кэш в FibonacciSequence.
+    """
+    
+    _shared: Optional['FibonacciCache'] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Инициализация кэша.
+        
+        Args:
+            max_bytes: Бюджет памяти на хранимые пары, в байтах (>= 0)
+            
+        Raises:
+            ValueError: Если max_bytes < 0
+        """
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes должно быть >= 0, получено {max_bytes}")
+        
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[int, Tuple[int, int]]' = OrderedDict()
+        self._sizes: Dict[int, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def shared(cls) -> 'FibonacciCache':
+        """Возвращает общий для всего процесса кэш (создаётся при первом вызове)."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    @staticmethod
+    def _entry_size(pair: Tuple[int, int]) -> int:
+        """Оценка памяти под пару: сам кортеж и оба больших числа."""
+        return sys.getsizeof(pair) + sys.getsizeof(pair[0]) + sys.getsizeof(pair[1])
+    
+    def lookup(self, keys: Iterable[int]) -> Optional[Tuple[int, Tuple[int, int]]]:
+        """
+        Ищет первый из ключей, присутствующий в кэше.
+        Один вызов считается одним попаданием или одним промахом.
+        
+        Args:
+            keys: Ключи в порядке предпочтения
+            
+        Returns:
+            Optional[Tuple[int, Tuple[int, int]]]: (ключ, пара) или None
+        """
+        with self._lock:
+            for key in keys:
+                pair = self._entries.get(key)
+                if pair is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return key, pair
+            self.misses += 1
+            return None
+    
+    def put(self, key: int, pair: Tuple[int, int]) -> None:
+        """
+        Сохраняет пару, вытесняя самые старые записи сверх бюджета.
+        Пара крупнее всего бюджета не сохраняется.
+        
+        Args:
+            key: Индекс k
+            pair: (F(k), F(k + 1))
+        """
+        size = self._entry_size(pair)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = pair
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Очищает кэш и статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает статистику кэша.
+        
+        Returns:
+            Dict[str, float]: hits, misses, hit_rate, evictions,
+                entries, bytes, max_bytes
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
 
 
 class FibonacciSequence:
@@ -17,9 +144,37 @@ class FibonacciSequence:
     Использует генератор для экономии памяти.
     """
     
-    def __init__(self):
-        """Инициализация класса."""
-        self._cache = {0: 0, 1: 1}  # Кэш для оптимизации рекурсивных вызовов
+    # Период Пизано ищется перебором (не более 6m шагов) только для m <= PISANO_LIMIT
+    PISANO_LIMIT = 10 ** 6
+    # Для периодов не длиннее TABLE_LIMIT хранится вся таблица остатков
+    TABLE_LIMIT = 1 << 16
+    # Ограничения общих кэшей: число периодов и байты таблиц (LRU)
+    PISANO_CACHE_SIZE = 4096
+    RESIDUE_TABLES_MAX_BYTES = 16 * 1024 * 1024
+    
+    # Общие для всех экземпляров кэши: m -> период Пизано, m -> таблица F(k) mod m
+    _pisano_periods: 'OrderedDict[int, int]' = OrderedDict()
+    _residue_tables: 'OrderedDict[int, array]' = OrderedDict()
+    _residue_bytes = 0
+    _mod_lock = threading.Lock()
+    
+    def __init__(self, cache: Optional[FibonacciCache] = None, stride: int = 4):
+        """
+        Инициализация класса.
+        
+        Args:
+            cache: Кэш контрольных точек быстрого удвоения
+                   (по умолчанию общий для процесса FibonacciCache.shared())
+            stride: Сохранять каждую stride-ю точку цепочки удвоений (>= 1),
+                    промежуточные пересчитываются заново
+            
+        Raises:
+            ValueError: Если stride < 1
+        """
+        if stride < 1:
+            raise ValueError(f"stride должно быть >= 1, получено {stride}")
+        self._cache = cache if cache is not None else FibonacciCache.shared()
+        self.stride = stride
     
     def generate(self, n: int) -> Generator[int, None, None]:
         """
@@ -60,7 +215,8 @@ class FibonacciSequence:
     
     def get_nth(self, n: int) -> int:
         """
-        Возвращает n-е число Фибоначчи (рекурсивно с кэшированием).
+        Возвращает n-е число Фибоначчи методом быстрого удвоения
+        (O(log n) умножений больших чисел, без рекурсии).
         
         Args:
             n: Индекс числа (начиная с 1)
@@ -71,13 +227,245 @@ class FibonacciSequence:
         if n < 1:
             raise ValueError(f"n должно быть >= 1, получено {n}")
         
-        def _fib(k):
-            if k in self._cache:
-                return self._cache[k]
-            self._cache[k] = _fib(k-1) + _fib(k-2)
-            return self._cache[k]
+        return self._fib_pair(n)[0]
+    
+    def _fib_pair(self, n: int) -> Tuple[int, int]:
+        """
+        Вычисляет пару (F(n), F(n + 1)) быстрым удвоением:
+            F(2k)     = F(k) * (2 * F(k + 1) - F(k))
+            F(2k + 1) = F(k)^2 + F(k + 1)^2
+        
+        Промежуточные индексы - это старшие биты n (n >> s), поэтому
+        каждая stride-я из них сохраняется в кэше как контрольная точка:
+        следующий запрос с тем же префиксом начинает с ближайшей точки,
+        а соседний индекс (n +- 1) получается из сохранённой пары без удвоений.
+        
+        Args:
+            n: Индекс (n >= 0)
+            
+        Returns:
+            Tuple[int, int]: (F(n), F(n + 1))
+        """
+        cache = self._cache
+        bits = n.bit_length()
+        
+        # Один поиск на запрос (одно попадание или промах в статистике):
+        # сначала сам индекс и соседние, затем самый длинный префикс n
+        found = cache.lookup(itertools.chain((n, n + 1, n - 1),
+                                             (n >> s for s in range(1, bits))))
+        if found is None:
+            shift, a, b = bits, 0, 1
+        else:
+            key, (a, b) = found
+            # Сам индекс или соседний получаются одним сложением или вычитанием
+            if key == n:
+                return a, b
+            if key == n + 1:
+                return b - a, a
+            if key == n - 1:
+                return b, a + b
+            shift = bits - key.bit_length()
+        
+        stride = self.stride
+        for s in range(shift - 1, -1, -1):
+            # Удвоение: (F(k), F(k+1)) -> (F(2k), F(2k+1))
+            c = a * (2 * b - a)
+            d = a * a + b * b
+            if (n >> s) & 1:
+                a, b = d, c + d
+            else:
+                a, b = c, d
+            if s % stride == 0:
+                cache.put(n >> s, (a, b))
+        return a, b
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """Статистика кэша контрольных точек (попадания, промахи, память)."""
+        return self._cache.stats()
+    
+    @staticmethod
+    def _fib_pair_mod(n: int, m: int) -> Tuple[int, int]:
+        """
+        Пара (F(n) mod m, F(n + 1) mod m) быстрым удвоением по модулю:
+        числа не превышают m^2, сколько бы ни было n.
+        """
+        a, b = 0, 1 % m
+        for s in range(n.bit_length() - 1, -1, -1):
+            c = a * (2 * b - a) % m
+            d = (a * a + b * b) % m
+            if (n >> s) & 1:
+                a, b = d, (c + d) % m
+            else:
+                a, b = c, d
+        return a, b
+    
+    @classmethod
+    def pisano_period(cls, m: int) -> Optional[int]:
+        """
+        Возвращает период Пизано для модуля m (период F(k) mod m)
+        и кэширует его вместе с таблицей остатков, если она невелика.
+        Оба кэша общие для процесса и ограничены (PISANO_CACHE_SIZE периодов,
+        RESIDUE_TABLES_MAX_BYTES на таблицы), давно не использованные
+        модули вытесняются.
+        
+        Args:
+            m: Модуль (m >= 1)
+            
+        Returns:
+            Optional[int]: Период или None, если m > PISANO_LIMIT
+        """
+        if m > cls.PISANO_LIMIT:
+            return None
+        with cls._mod_lock:
+            period = cls._pisano_periods.get(m)
+            if period is not None:
+                cls._pisano_periods.move_to_end(m)
+                if m in cls._residue_tables:
+                    cls._residue_tables.move_to_end(m)
+                return period
+        
+        # Период не превосходит 6m; таблица копится, пока она не длиннее TABLE_LIMIT
+        table = array('Q', [0])
+        a, b = 0, 1 % m
+        period = 1
+        while True:
+            a, b = b, (a + b) % m
+            if a == 0 and b == 1 % m:
+                break
+            if period < cls.TABLE_LIMIT:
+                table.append(a)
+            period += 1
+        
+        with cls._mod_lock:
+            cls._pisano_periods[m] = period
+            if len(cls._pisano_periods) > cls.PISANO_CACHE_SIZE:
+                old_m, _ = cls._pisano_periods.popitem(last=False)
+                old = cls._residue_tables.pop(old_m, None)
+                if old is not None:
+                    cls._residue_bytes -= old.itemsize * len(old)
+            
+            size = table.itemsize * len(table)
+            if period <= cls.TABLE_LIMIT and m not in cls._residue_tables \
+                    and size <= cls.RESIDUE_TABLES_MAX_BYTES:
+                cls._residue_tables[m] = table
+                cls._residue_bytes += size
+                while cls._residue_bytes > cls.RESIDUE_TABLES_MAX_BYTES:
+                    _, old = cls._residue_tables.popitem(last=False)
+                    cls._residue_bytes -= old.itemsize * len(old)
+        return period
+    
+    def get_nth_mod(self, n: int, m: int) -> int:
+        """
+        Возвращает F(n) mod m, не вычисляя само большое число.
+        Индекс сокращается по периоду Пизано, для коротких периодов
+        ответ берётся из таблицы остатков.
+        
+        Args:
+            n: Индекс числа (начиная с 1, как в get_nth)
+            m: Модуль (m >= 1)
+            
+        Returns:
+            int: F(n) mod m
+            
+        Raises:
+            ValueError: Если n < 1 или m < 1
+        """
+        if n < 1:
+            raise ValueError(f"n должно быть >= 1, получено {n}")
+        if m < 1:
+            raise ValueError(f"m должно быть >= 1, получено {m}")
+        return self._nth_mod(n, m, self.pisano_period(m))
+    
+    def _nth_mod(self, n: int, m: int, period: Optional[int]) -> int:
+        """F(n) mod m при уже найденном периоде Пизано."""
+        if period is None:
+            return self._fib_pair_mod(n, m)[0]
+        n %= period
+        table = self._residue_tables.get(m)
+        if table is not None:
+            return table[n]
+        return self._fib_pair_mod(n, m)[0]
+    
+    def get_nth_mod_batch(self, indices: Iterable[int], m: int) -> List[int]:
+        """
+        Возвращает F(n) mod m для набора индексов; период Пизано
+        и таблица остатков находятся один раз на весь набор.
+        
+        Args:
+            indices: Индексы (каждый >= 1)
+            m: Модуль (m >= 1)
+            
+        Returns:
+            List[int]: Остатки в порядке индексов
+            
+        Raises:
+            ValueError: Если какой-либо индекс < 1 или m < 1
+        """
+        if m < 1:
+            raise ValueError(f"m должно быть >= 1, получено {m}")
+        period = self.pisano_period(m)
+        results = []
+        for n in indices:
+            if n < 1:
+                raise ValueError(f"n должно быть >= 1, получено {n}")
+            results.append(self._nth_mod(n, m, period))
+        return results
+    
+    def generate_mod(self, n: int, m: int) -> Generator[int, None, None]:
+        """
+        Генерирует первые n чисел Фибоначчи по модулю m
+        (то же, что generate, но без больших чисел).
+        
+        Args:
+            n: Количество чисел для генерации (n >= 1)
+            m: Модуль (m >= 1)
+            
+        Yields:
+            int: Следующее число Фибоначчи по модулю m
+            
+        Raises:
+            ValueError: Если n < 1 или m < 1
+        """
+        if n < 1:
+            raise ValueError(f"n должно быть >= 1, получено {n}")
+        if m < 1:
+            raise ValueError(f"m должно быть >= 1, получено {m}")
         
-        return _fib(n)
+        a, b = 0, 1 % m
+        for _ in range(n):
+            yield a
+            a, b = b, (a + b) % m
+    
+    def generate_mod_batch(self, n: int, moduli: Iterable[int]) -> Dict[int, List[int]]:
+        """
+        Возвращает первые n чисел Фибоначчи по каждому из модулей.
+        Для модулей с таблицей остатков списки собираются из таблицы
+        целыми периодами, без пошагового сложения.
+        
+        Args:
+            n: Количество чисел (n >= 1)
+            moduli: Модули (каждый >= 1)
+            
+        Returns:
+            Dict[int, List[int]]: Модуль -> список остатков
+            
+        Raises:
+            ValueError: Если n < 1 или какой-либо модуль < 1
+        """
+        if n < 1:
+            raise ValueError(f"n должно быть >= 1, получено {n}")
+        result = {}
+        for m in moduli:
+            if m < 1:
+                raise ValueError(f"m должно быть >= 1, получено {m}")
+            period = self.pisano_period(m)
+            table = self._residue_tables.get(m) if period is not None else None
+            if table is None:
+                result[m] = list(self.generate_mod(n, m))
+            else:
+                repeats, rest = divmod(n, period)
+                result[m] = (table * repeats + table[:rest]).tolist()
+        return result
     
     def get_sequence_list(self, n: int) -> List[int]:
         """